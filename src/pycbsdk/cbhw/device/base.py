@@ -1,14 +1,21 @@
-from collections import defaultdict
 from ctypes import Structure
 import threading
 import typing
 
+import numpy as np
+
 from pycbsdk.cbhw.packet.common import CBChannelType, CBPacketType
 from pycbsdk.cbhw.packet.factory import CBPacketFactory
 from pycbsdk.cbhw.params import Params
 
 
 CBPktCallBack = typing.Callable[[Structure], None]
+# Called with (times, chids, units) arrays for a batch of event packets.
+CBEventBatchCallBack = typing.Callable[[np.ndarray, np.ndarray, np.ndarray], None]
+# Called with (pkt_time, pkt_bytes) for a raw packet, header included.
+CBRawCallBack = typing.Callable[[int, bytes], None]
+# Called with (times, samples) arrays for a batch of group packets.
+CBGroupBatchCallBack = typing.Callable[[np.ndarray, np.ndarray], None]
 
 
 class DeviceInterface:
@@ -23,28 +30,45 @@ class DeviceInterface:
             "runlevel_standby": threading.Event(),
             "runlevel_running": threading.Event(),
             "chaninfo": threading.Event(),
+            "nplay": threading.Event(),
+            "lnc": threading.Event(),
         }
         self._config = {
-            "channel_types": defaultdict(
-                lambda: CBChannelType.Any
-            ),  # Filled in upon receiving device config.
+            # Filled in upon receiving device config. Read with .get(chid, CBChannelType.Any).
+            "channel_types": {},
             "proc_chans": 0,
             "channel_infos": {},
             "group_infos": {},
             "sysfreq": None,  # Should be 30_000 for legacy or 1e9 for Gemini PTP
         }
-        # Init group_callbacks dict with an empty list for each supported smp grp (1-5:SMP; 6:RAW)
-        self.group_callbacks: typing.Dict[int, typing.List[CBPktCallBack]] = {
-            _: [] for _ in range(1, 7)
+        # Callback registries are dispatched per packet, so callbacks are stored as tuples (cheapest to iterate)
+        #  that are replaced wholesale on (un)registration rather than mutated in place.
+        # Init group_callbacks dict with an empty tuple for each supported smp grp (1-5:SMP; 6:RAW).
+        self.group_callbacks: typing.Dict[int, typing.Tuple[CBPktCallBack, ...]] = {
+            _: () for _ in range(1, 7)
         }
-        # Init event_callbacks with an empty list for each known channel type.
-        self.event_callbacks: typing.Dict[CBChannelType, typing.List[CBPktCallBack]] = {
-            _: [] for _ in CBChannelType
+        self.group_raw_callbacks: typing.Dict[int, typing.Tuple[CBRawCallBack, ...]] = {
+            _: () for _ in range(1, 7)
         }
-        # Init config_callbacks as a defaultdict that will create an empty list on-the-fly for unseen keys.
-        self.config_callbacks: defaultdict[CBPacketType, typing.List[CBPktCallBack]] = (
-            defaultdict(lambda: [])
-        )
+        self.group_batch_callbacks: typing.Dict[
+            int, typing.Tuple[CBGroupBatchCallBack, ...]
+        ] = {_: () for _ in range(1, 7)}
+        # Init event_callbacks with an empty tuple for each known channel type.
+        self.event_callbacks: typing.Dict[
+            CBChannelType, typing.Tuple[CBPktCallBack, ...]
+        ] = {_: () for _ in CBChannelType}
+        # Per channel type, its event_callbacks followed by those registered for CBChannelType.Any;
+        #  precomputed on (un)registration so dispatch needs no per-packet tuple concatenation.
+        self.event_dispatch_callbacks: typing.Dict[
+            CBChannelType, typing.Tuple[CBPktCallBack, ...]
+        ] = {_: () for _ in CBChannelType}
+        self.event_batch_callbacks: typing.Dict[
+            CBChannelType, typing.Tuple[CBEventBatchCallBack, ...]
+        ] = {_: () for _ in CBChannelType}
+        # config_callbacks entries are created on registration. Read with .get(pkt_type, ()).
+        self.config_callbacks: typing.Dict[
+            CBPacketType, typing.Tuple[CBPktCallBack, ...]
+        ] = {}
         self._params = params
         self.packet_factory = CBPacketFactory(protocol=self._params.protocol)
         self.pkts_received = 0
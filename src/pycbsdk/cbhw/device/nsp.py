@@ -23,17 +23,17 @@ synchronization primitives should be used.
 
 """
 
-import copy
-from ctypes import Structure, create_string_buffer
+from ctypes import Structure
 import logging
 import socket
 from collections.abc import Callable
 from enum import IntEnum, IntFlag
 from typing import Optional
-import struct
 import threading
 import time
 
+import numpy as np
+
 # NOTE: We cannot import from .packet.packets until after config.protocol is set;
 # other .packet.{submodules} are OK.
 from pycbsdk.cbhw.device.base import DeviceInterface
@@ -48,6 +48,7 @@ from pycbsdk.cbhw.packet.common import (
     CBHoop,
     MAX_UNITS,
     MAX_HOOPS,
+    DEFAULT_TIMEOUT,
 )
 from pycbsdk.cbhw.params import Params
 from pycbsdk.cbhw.consts import CBError
@@ -73,6 +74,33 @@ cbNUM_SERIAL_CHANS = 1
 cbNUM_DIGOUT_CHANS = 4
 # endregion
 GET_CONFIG_TIMEOUT = 2.0
+# Safe lowpass digital filter for smpgroups 1-4. Other groups get no filter (0).
+_SMPGROUP_SMPFILTER = {1: 5, 2: 6, 3: 7, 4: 10}
+# LOGREP mode -> logging level. Other modes are logged at INFO.
+_LOG_MODE_LEVELS = {0: logging.INFO, 1: logging.CRITICAL, 5: logging.ERROR}
+# Limited-scope CHANREP* packets may carry garbage outside their scope, so only these chaninfo fields are copied.
+# Note: Some types have overlapping fields.
+_CHANREP_FIELDS = {
+    CBPacketType.CHANREPAINP: ("ainpopts", "lncrate", "refelecchan"),
+    CBPacketType.CHANREPSPK: ("spkopts", "spkfilter"),
+    CBPacketType.CHANREPREJECTAMPLITUDE: ("spkopts", "amplrejpos", "amplrejneg"),
+    CBPacketType.CHANREPAUTOTHRESHOLD: ("spkopts",),
+    CBPacketType.CHANREPSMP: ("smpfilter", "smpgroup"),
+    # TODO: .unitmapping[n].bValid = pkt.spkhoops[n][0].valid ??
+    CBPacketType.CHANREPSPKHPS: ("spkhoops",),
+    # TODO: .union.a.moninst, .union.a.monchan
+    CBPacketType.CHANREPAOUT: ("aoutopts",),
+    CBPacketType.CHANREPSCALE: ("scalin", "scalout"),
+    # TODO: NOTE: Need extra check if this is for serial or digital?
+    CBPacketType.CHANREPDINP: ("dinpopts", "eopchar"),
+    # TODO: .moninst, .monchan, .outvalue, more..., from union?
+    CBPacketType.CHANREPDOUT: ("doutopts", "doutcaps"),
+    CBPacketType.CHANREPLABEL: ("label", "userflags"),
+    CBPacketType.CHANREPSPKTHR: ("spkthrlevel",),
+    # TODO: from CHANREPNTRODEGROUP, .spkgroup
+    # TODO: from CHANREPDISP, .smpdispmin, .smpdispmax, .spkdispmax, .lncdispmax
+    # TODO: from CHANREPUNITOVERRIDES, .unitmapping
+}
 
 
 # region Enums
@@ -241,11 +269,11 @@ class LNCRate:
 
     @staticmethod
     def GetLNCRate(key) -> int:
-        try:
-            return LNCRate.lnc_rates[key]
-        except KeyError:
-            print("Error with LNC rate key.")
+        rate = LNCRate.lnc_rates.get(key)
+        if rate is None:
+            logger.warning(f"Unknown LNC rate key {key!r}; using 0.")
             return 0
+        return rate
 
 
 # endregion
@@ -255,21 +283,61 @@ class LNCRate:
 SpikeEvent = tuple[int, int, int]  # proctime, channel_id, unit_id
 
 
+def _clone_struct(pkt: Structure) -> Structure:
+    """
+    Copy a fixed-size packet (e.g., a chaninfo) in one buffer copy.
+    Much faster than copy.copy, which round-trips through __reduce__.
+    Not for variable-length packets; their payload may live outside the struct.
+    """
+    return type(pkt).from_buffer_copy(pkt)
+
+
+def _clone_varlen(pkt: Structure) -> Structure:
+    """
+    Copy a variable-length packet, payload included, into memory it owns.
+    copy.copy is not enough: it shares `_array`, which may be a view into a pooled slot.
+    """
+    return type(pkt)(bytes(pkt))
+
+
+def _resolve_ipv4(host: str) -> str:
+    """
+    Resolve host to a dotted-quad IPv4 address.
+    Numeric addresses (including 0.0.0.0 and 255.255.255.255) are parsed directly and never reach the resolver.
+    """
+    try:
+        return socket.inet_ntoa(socket.inet_aton(host))
+    except OSError:
+        return socket.gethostbyname(host)
+
+
+_FE_CAPS = int(CBChanCaps.isolated | CBChanCaps.ainp)
+# Option bits cleared by configure_channel_disable.
+_DISABLE_AINPOPTS = int(
+    CBAnaInpOpts.refelec_offsetcorrect  # DC offset
+    | CBAnaInpOpts.lnc_mask
+    | CBAnaInpOpts.refelec_mask
+    | CBAnaInpOpts.refelec_rawstream
+)
+_DISABLE_SPKOPTS = int(CBAInpSpk.EXTRACT | CBAInpSpk.THRAUTO)
+
+
 def get_chantype_from_chaninfo(pkt) -> CBChannelType:
-    if (CBChanCaps.isolated | CBChanCaps.ainp) == (
-        pkt.chancaps & (CBChanCaps.isolated | CBChanCaps.ainp)
-    ):
+    # Read the ctypes field once; each access (and each IntEnum `|`) builds a new object.
+    caps = pkt.chancaps
+    ainp_caps = caps & _FE_CAPS
+    if ainp_caps == _FE_CAPS:
         return CBChannelType.FrontEnd
-    elif (pkt.chancaps & CBChanCaps.ainp) and not (pkt.chancaps & CBChanCaps.isolated):
+    elif ainp_caps == CBChanCaps.ainp:
         return CBChannelType.AnalogIn
-    elif pkt.chancaps & CBChanCaps.dinp:
+    elif caps & CBChanCaps.dinp:
         if pkt.dinpcaps & CBDigInpCaps.serialmask:
             return CBChannelType.Serial
         else:
             return CBChannelType.DigitalIn
-    elif pkt.chancaps & CBChanCaps.dout:
+    elif caps & CBChanCaps.dout:
         return CBChannelType.DigitalOut
-    elif (pkt.chancaps & CBChanCaps.aout) and (pkt.aoutcaps & CBAnaOutCaps.audio):
+    elif (caps & CBChanCaps.aout) and (pkt.aoutcaps & CBAnaOutCaps.audio):
         return CBChannelType.Audio
 
 
@@ -280,9 +348,25 @@ class NSPDevice(DeviceInterface):
         # State
         self._config["runlevel"] = CBRunLevel.STARTUP
         self._config["nplay"] = None
+        self._config["lnc"] = None
         self._config["transport"] = CBTransport.CHECK
         self.last_time = 1
         self._monitor_state["time"] = 1
+        # SYSPROTOCOLMONITOR packets carry a counter from protocol 4.2 onwards.
+        v_int = [int(_) for _ in self._params.protocol.split(".")]
+        self._proto_has_counter = v_int[0] > 4 or (v_int[0] == 4 and v_int[1] > 1)
+        # Each channel configuration packet we send gets a sequence number (seq) for its reply.
+        #  chid -> (reply type, seq) of the replies still expected, oldest first.
+        self._chanrep_expected: dict[int, list[tuple[int, int]]] = {}
+        # seq -> chid of the replies still expected.
+        self._chanrep_pending: dict[int, int] = {}
+        self._chanrep_next_seq = 0
+        # Guards the above; notified whenever an expected reply arrives.
+        self._chanrep_cond = threading.Condition()
+        # Sorted chid arrays per channel type. Rebuilt lazily after a channel's type changes.
+        self._chids_by_type: Optional[dict[CBChannelType, np.ndarray]] = None
+        # Held while a REQCONFIGALL cascade is in flight.
+        self._config_refresh_lock = threading.Lock()
 
         # Placeholders for IO
         self._sender_queue = None
@@ -302,15 +386,21 @@ class NSPDevice(DeviceInterface):
             "spkfilter": self._configure_channel_spkfilter,
             "spkthrlevel": self._configure_spk_threshold,
         }
+        # configure_channel_spike matches attr_name against these prefixes.
+        self._spike_config_func_map = {
+            "enable": self._configure_channel_enable_spike,
+            "autothresh": self._configure_channel_autothreshold,
+            "hoops": self._configure_channel_hoops,
+        }
 
         # Receives broadcast UDP (or unicast targeting the adapter at client_addr).
         self._local_addr = (
-            socket.gethostbyname(self._params.client_addr),
+            _resolve_ipv4(self._params.client_addr),
             self._params.client_port,
         )
         # Send to a specific address
         self._device_addr = (
-            socket.gethostbyname(self._params.inst_addr),
+            _resolve_ipv4(self._params.inst_addr),
             self._params.inst_port,
         )
 
@@ -324,137 +414,121 @@ class NSPDevice(DeviceInterface):
 
     # region BasicCallbacks
     def _register_basic_callbacks(self):
-        self.register_config_callback(CBPacketType.REPCONFIGALL, self._handle_configall)
-        self.register_config_callback(CBPacketType.SYSREP, self._handle_sysrep)
-        self.register_config_callback(CBPacketType.SYSREPRUNLEV, self._handle_sysrep)
-        self.register_config_callback(CBPacketType.SYSREPTRANSPORT, self._handle_sysrep)
-        self.register_config_callback(CBPacketType.CHANREP, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPSMP, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPSPKHPS, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPSPK, self._handle_chaninfo)
-        self.register_config_callback(
-            CBPacketType.CHANREPAUTOTHRESHOLD, self._handle_chaninfo
+        chaninfo_types = (
+            CBPacketType.CHANREP,
+            CBPacketType.CHANREPSMP,
+            CBPacketType.CHANREPSPKHPS,
+            CBPacketType.CHANREPSPK,
+            CBPacketType.CHANREPAUTOTHRESHOLD,
+            CBPacketType.CHANREPREJECTAMPLITUDE,
+            CBPacketType.CHANREPAOUT,
+            CBPacketType.CHANREPSCALE,
+            CBPacketType.CHANREPDINP,
+            CBPacketType.CHANREPDOUT,
+            CBPacketType.CHANREPLABEL,
+            CBPacketType.CHANREPAINP,
+            CBPacketType.CHANREPSPKTHR,
         )
-        self.register_config_callback(
-            CBPacketType.CHANREPREJECTAMPLITUDE, self._handle_chaninfo
+        # Packets we are aware of but do not handle yet go to the _black_hole (do nothing) callback.
+        ignored_types = (
+            CBPacketType.SYSHEARTBEAT,
+            CBPacketType.SS_MODELREP,
+            CBPacketType.SS_DETECTREP,
+            CBPacketType.ADAPTFILTREP,
+            CBPacketType.SS_ARTIF_REJECTREP,
+            CBPacketType.SS_NOISE_BOUNDARYREP,
+            CBPacketType.SS_STATISTICSREP,
+            CBPacketType.REPFILECFG,
+            CBPacketType.SS_STATUSREP,
+            CBPacketType.FILTREP,
+            CBPacketType.BANKREP,
+            CBPacketType.REPNTRODEINFO,
+            CBPacketType.REFELECFILTREP,
         )
-        self.register_config_callback(CBPacketType.CHANREPAOUT, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPSCALE, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPDINP, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPDOUT, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPLABEL, self._handle_chaninfo)
-
-        self.register_config_callback(CBPacketType.CHANREPAINP, self._handle_chaninfo)
-        self.register_config_callback(CBPacketType.CHANREPSPKTHR, self._handle_chaninfo)
-
-        self.register_config_callback(CBPacketType.GROUPREP, self._handle_groupinfo)
-        self.register_config_callback(CBPacketType.PROCREP, self._handle_procinfo)
-        self.register_config_callback(CBPacketType.NPLAYREP, self._handle_nplay)
-        self.register_config_callback(
-            CBPacketType.SYSPROTOCOLMONITOR, self._handle_procmon
-        )
-        self.register_config_callback(CBPacketType.LOGREP, self._handle_log)
-        # Register the _black_hole (do nothing) callback for packets we are aware of but do not handle yet
-        self.register_config_callback(CBPacketType.SYSHEARTBEAT, self._black_hole)
-        self.register_config_callback(CBPacketType.SS_MODELREP, self._black_hole)
-        self.register_config_callback(CBPacketType.SS_DETECTREP, self._black_hole)
-        self.register_config_callback(CBPacketType.ADAPTFILTREP, self._black_hole)
-        self.register_config_callback(CBPacketType.SS_ARTIF_REJECTREP, self._black_hole)
-        self.register_config_callback(CBPacketType.LNCREP, self._black_hole)
-        self.register_config_callback(
-            CBPacketType.SS_NOISE_BOUNDARYREP, self._black_hole
-        )
-        self.register_config_callback(CBPacketType.SS_STATISTICSREP, self._black_hole)
-        self.register_config_callback(CBPacketType.REPFILECFG, self._black_hole)
-        self.register_config_callback(CBPacketType.SS_STATUSREP, self._black_hole)
-        self.register_config_callback(CBPacketType.FILTREP, self._black_hole)
-        self.register_config_callback(CBPacketType.BANKREP, self._black_hole)
-        self.register_config_callback(CBPacketType.REPNTRODEINFO, self._black_hole)
-        self.register_config_callback(CBPacketType.REFELECFILTREP, self._black_hole)
+        handlers = {
+            CBPacketType.REPCONFIGALL: self._handle_configall,
+            CBPacketType.SYSREP: self._handle_sysrep,
+            CBPacketType.SYSREPRUNLEV: self._handle_sysrep,
+            CBPacketType.SYSREPTRANSPORT: self._handle_sysrep,
+            **{_: self._handle_chaninfo for _ in chaninfo_types},
+            CBPacketType.GROUPREP: self._handle_groupinfo,
+            CBPacketType.PROCREP: self._handle_procinfo,
+            CBPacketType.NPLAYREP: self._handle_nplay,
+            CBPacketType.LNCREP: self._handle_lnc,
+            CBPacketType.SYSPROTOCOLMONITOR: self._handle_procmon,
+            CBPacketType.LOGREP: self._handle_log,
+            **{_: self._black_hole for _ in ignored_types},
+        }
+        register = self.register_config_callback
+        for pkt_type, handler in handlers.items():
+            register(pkt_type, handler)
 
     def _handle_sysrep(self, pkt):
-        logger.info(
-            f"SYSREP --\trunlevel:{CBRunLevel(pkt.runlevel)!r}\tproctime:{pkt.header.time}"
-        )
-        b_general = pkt.header.type == CBPacketType.SYSREP
-        if (b_general or pkt.header.type == CBPacketType.SYSREPTRANSPORT) and hasattr(
+        pkt_type = pkt.header.type
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"SYSREP --\trunlevel:{CBRunLevel(pkt.runlevel)!r}\tproctime:{pkt.header.time}"
+            )
+        config = self._config
+        b_general = pkt_type == CBPacketType.SYSREP
+        if (b_general or pkt_type == CBPacketType.SYSREPTRANSPORT) and hasattr(
             pkt, "transport"
         ):
             # This feature is only available in Chad's beta nplayserver.
-            self._config["transport"] = pkt.transport  # bitwise or'd flags
-        if b_general or pkt.header.type == CBPacketType.SYSREPRUNLEV:
-            self._config["runlevel"] = CBRunLevel(pkt.runlevel)
-            self._config["sysfreq"] = pkt.sysfreq
+            config["transport"] = pkt.transport  # bitwise or'd flags
+        b_runlevel = b_general or pkt_type == CBPacketType.SYSREPRUNLEV
+        if b_runlevel:
+            config["runlevel"] = CBRunLevel(pkt.runlevel)
+            config["sysfreq"] = pkt.sysfreq
         self._config_events["sysrep"].set()
-        if b_general or pkt.header.type == CBPacketType.SYSREPRUNLEV:
-            if self._config["runlevel"] == CBRunLevel.STANDBY:
+        if b_runlevel:
+            if config["runlevel"] == CBRunLevel.STANDBY:
                 self._config_events["runlevel_standby"].set()
-            elif self._config["runlevel"] == CBRunLevel.RUNNING:
+            elif config["runlevel"] == CBRunLevel.RUNNING:
                 self._config_events["runlevel_running"].set()
 
     def _handle_chaninfo(self, pkt):
+        # Each pkt.header access builds a new ctypes object, so read the header fields once.
+        pkt_type = pkt.header.type
+        chan = pkt.chan
         # If this config packet is limited in scope then it might have some garbage data in its out-of-scope payload.
         # We should update our config, but only the parts that this REP packet is scoped to.
-        if pkt.header.type in [CBPacketType.CHANREP]:
+        if pkt_type == CBPacketType.CHANREP:
             # Full scope; overwrite our config.
-            self._config["channel_infos"][pkt.chan] = copy.copy(pkt)
-            self._config["channel_types"][pkt.chan] = get_chantype_from_chaninfo(pkt)
+            channel_infos = self._config["channel_infos"]
+            b_new = chan not in channel_infos
+            channel_infos[chan] = _clone_struct(pkt)
+            chantype = get_chantype_from_chaninfo(pkt)
+            channel_types = self._config["channel_types"]
+            if channel_types.get(chan) != chantype:
+                channel_types[chan] = chantype
+                self._chids_by_type = None
+            elif b_new:
+                self._chids_by_type = None
         else:
-            # Note: Some types have overlapping fields.
-            if pkt.header.type == CBPacketType.CHANREPAINP:
-                self._config["channel_infos"][pkt.chan].ainpopts = pkt.ainpopts
-                self._config["channel_infos"][pkt.chan].lncrate = pkt.lncrate
-                self._config["channel_infos"][pkt.chan].refelecchan = pkt.refelecchan
-            elif pkt.header.type == CBPacketType.CHANREPSPK:
-                self._config["channel_infos"][pkt.chan].spkopts = pkt.spkopts
-                self._config["channel_infos"][pkt.chan].spkfilter = pkt.spkfilter
-            elif pkt.header.type in [CBPacketType.CHANREPREJECTAMPLITUDE]:
-                self._config["channel_infos"][pkt.chan].spkopts = pkt.spkopts
-                self._config["channel_infos"][pkt.chan].amplrejpos = pkt.amplrejpos
-                self._config["channel_infos"][pkt.chan].amplrejneg = pkt.amplrejneg
-            elif pkt.header.type == CBPacketType.CHANREPAUTOTHRESHOLD:
-                self._config["channel_infos"][pkt.chan].spkopts = pkt.spkopts
-            elif pkt.header.type == CBPacketType.CHANREPSMP:
-                self._config["channel_infos"][pkt.chan].smpfilter = pkt.smpfilter
-                self._config["channel_infos"][pkt.chan].smpgroup = pkt.smpgroup
-            elif pkt.header.type == CBPacketType.CHANREPSPKHPS:
-                self._config["channel_infos"][pkt.chan].spkhoops = pkt.spkhoops
-                # TODO: .unitmapping[n].bValid = pkt.spkhoops[n][0].valid ??
-            elif pkt.header.type == CBPacketType.CHANREPAOUT:
-                self._config["channel_infos"][pkt.chan].aoutopts = pkt.aoutopts
-                # self._config["channel_infos"][pkt.chan].union.a.moninst = pkt.moninst
-                # self._config["channel_infos"][pkt.chan].union.a.monchan = pkt.monchan
-            elif pkt.header.type == CBPacketType.CHANREPSCALE:
-                self._config["channel_infos"][pkt.chan].scalein = pkt.scalein
-                self._config["channel_infos"][pkt.chan].scaleout = pkt.scaleout
-            elif pkt.header.type == CBPacketType.CHANREPDINP:
-                # TODO: NOTE: Need extra check if this is for serial or digital?
-                self._config["channel_infos"][pkt.chan].dinpopts = pkt.dinpopts
-                self._config["channel_infos"][pkt.chan].eopchar = pkt.eopchar
-            elif pkt.header.type == CBPacketType.CHANREPDOUT:
-                self._config["channel_infos"][pkt.chan].doutopts = pkt.doutopts
-                self._config["channel_infos"][pkt.chan].doutcaps = pkt.doutcaps
-                # TODO: .moninst, .monchan, .outvalue, more..., from union?
-            elif pkt.header.type == CBPacketType.CHANREPLABEL:
-                self._config["channel_infos"][pkt.chan].label = pkt.label
-                self._config["channel_infos"][pkt.chan].userflags = pkt.userflags
-            elif pkt.header.type == CBPacketType.CHANSETSPKTHR:
-                # TODO: from CHANREPSPKTHR, .spkthrlevel
-                self._config["channel_infos"][pkt.chan].spkthrlevel = pkt.spkthrlevel
-
-            else:
-                # TODO: from CHANREPNTRODEGROUP, .spkgroup
-                # TODO: from CHANREPDISP, .smpdispmin, .smpdispmax, .spkdispmax, .lncdispmax
-                # TODO: from CHANREPUNITOVERRIDES, .unitmapping
-                pass
-        # print(f"handled chaninfo {pkt.chan} of type {hex(pkt.header.type)}")
+            fields = _CHANREP_FIELDS.get(pkt_type)
+            if fields is not None:
+                entry = self._config["channel_infos"][chan]
+                for field in fields:
+                    setattr(entry, field, getattr(pkt, field))
+        # print(f"handled chaninfo {chan} of type {hex(pkt_type)}")
+        if self._chanrep_expected:
+            with self._chanrep_cond:
+                expected = self._chanrep_expected.get(chan, ())
+                # The device replies in order, so this answers the oldest packet of this type.
+                for ix, (rep_type, seq) in enumerate(expected):
+                    if rep_type == pkt_type:
+                        del expected[ix]
+                        if not expected:
+                            del self._chanrep_expected[chan]
+                        del self._chanrep_pending[seq]
+                        self._chanrep_cond.notify_all()
+                        break
         self._config_events["chaninfo"].set()
 
     def _handle_groupinfo(self, pkt):
-        if pkt.length > 0:
-            chan_list = set(pkt.chan_list.flatten())
-        else:
-            chan_list = set()
+        # tolist() converts to Python ints in C; iterating the array would box a NumPy scalar per element.
+        chan_list = set(pkt.chan_list.tolist()) if pkt.length > 0 else set()
         self._config["group_infos"][pkt.group] = chan_list
 
     def _handle_configall(self, pkt):
@@ -462,52 +536,57 @@ class NSPDevice(DeviceInterface):
             logger.warning("REPCONFIGALL has unexpected payload")
 
     def _handle_procinfo(self, pkt):
-        vmin, vmaj = struct.unpack("HH", struct.pack("I", pkt.version))
+        version = pkt.version
+        vmin, vmaj = version & 0xFFFF, (version >> 16) & 0xFFFF
         prot_str = f"{vmaj}.{vmin}"
         logger.info(f"Protocol version {prot_str}")
         self._config["proc_chans"] = pkt.chancount
         # config.protocol = prot_str  # Too late; we already loaded our factory if we got this far.
 
     def _handle_nplay(self, pkt):
-        self._config["nplay"] = pkt
+        # pkt and its fname payload may be views into a pooled slot; keep a detached copy.
+        self._config["nplay"] = _clone_varlen(pkt)
+        self._config_events["nplay"].set()
+
+    def _handle_lnc(self, pkt):
+        self._config["lnc"] = _clone_struct(pkt)
+        self._config_events["lnc"].set()
 
     def _handle_procmon(self, pkt):
         arrival_time = time.time()
-        update_interval = max(pkt.header.time - self._monitor_state["time"], 1)
+        pkt_time = pkt.header.time
+        update_interval = max(pkt_time - self._monitor_state["time"], 1)
         pkt_delta = self.pkts_received - self._monitor_state["pkts_received"]
 
-        v_int = [int(_) for _ in self._params.protocol.split(".")]
-        has_counter = v_int[0] > 4 or (v_int[0] == 4 and v_int[1] > 1)
+        has_counter = self._proto_has_counter
         if has_counter and pkt.counter > (self._monitor_state["counter"] + 1):
             logger.warning("Missing SYSPROTOCOLMONITOR packets.")
 
-        logger.info(
-            f"SYSPROTOCOLMONITOR:\tpkts_received - {self.pkts_received}"
-            f";\ttime - {pkt.header.time}"
-            f";\tcounter - {pkt.counter if has_counter else 'N/A'}"
-            f";\tdelta - {pkt_delta}"
-            f";\tsent - {pkt.sentpkts}"
-            f";\trate (pkt/samp) - {pkt_delta/update_interval}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"SYSPROTOCOLMONITOR:\tpkts_received - {self.pkts_received}"
+                f";\ttime - {pkt_time}"
+                f";\tcounter - {pkt.counter if has_counter else 'N/A'}"
+                f";\tdelta - {pkt_delta}"
+                f";\tsent - {pkt.sentpkts}"
+                f";\trate (pkt/samp) - {pkt_delta/update_interval}"
+            )
         self._monitor_state = {
             "counter": pkt.counter if has_counter else -1,
-            "time": pkt.header.time,
+            "time": pkt_time,
             "pkts_received": self.pkts_received,
             "sys_time": arrival_time,
         }
 
     def _handle_log(self, pkt):
-        log_lvls = {0: logging.INFO, 1: logging.CRITICAL, 5: logging.ERROR}
-        log_lvl = log_lvls.get(pkt.mode, logging.INFO)
-        logger.log(log_lvl, f"Log from {pkt.name}:\t{pkt.desc}")
+        log_lvl = _LOG_MODE_LEVELS.get(pkt.mode, logging.INFO)
+        logger.log(log_lvl, "Log from %s:\t%s", pkt.name, pkt.desc)
 
     def _black_hole(self, pkt):
-        _old = len(g_debug_unhandled_packets)
-        g_debug_unhandled_packets.add(pkt.header.type)
-        if len(g_debug_unhandled_packets) > _old:
-            logger.debug(
-                f"Ignoring {type(pkt)} packets with type {hex(pkt.header.type)}"
-            )
+        pkt_type = pkt.header.type
+        if pkt_type not in g_debug_unhandled_packets:
+            g_debug_unhandled_packets.add(pkt_type)
+            logger.debug(f"Ignoring {type(pkt)} packets with type {hex(pkt_type)}")
 
     # endregion
 
@@ -516,16 +595,64 @@ class NSPDevice(DeviceInterface):
         self, group: int, callback: Callable[[Structure], None]
     ):
         # TODO: Make this thread safe.
-        self.group_callbacks[group].append(callback)
+        self.group_callbacks[group] += (callback,)
 
     def unregister_group_callback(
         self, group: int, callback: Callable[[Structure], None]
     ) -> int:
-        if callback in self.group_callbacks[group]:
-            self.group_callbacks[group].remove(callback)
-            return 0
-        else:
+        callbacks = self.group_callbacks[group]
+        try:
+            i = callbacks.index(callback)
+        except ValueError:
+            return -1
+        self.group_callbacks[group] = callbacks[:i] + callbacks[i + 1 :]
+        return 0
+
+    def register_group_raw_callback(
+        self, group: int, callback: Callable[[int, bytes], None]
+    ):
+        """
+        Receive group packets as raw bytes. No packet objects are constructed.
+        :param group: sample group id (1-6).
+        :param callback: called with (pkt_time, pkt_bytes). pkt_bytes includes the packet header;
+            the samples start at self.packet_factory.header_size.
+        """
+        # TODO: Make this thread safe.
+        self.group_raw_callbacks[group] += (callback,)
+
+    def unregister_group_raw_callback(
+        self, group: int, callback: Callable[[int, bytes], None]
+    ) -> int:
+        callbacks = self.group_raw_callbacks[group]
+        try:
+            i = callbacks.index(callback)
+        except ValueError:
+            return -1
+        self.group_raw_callbacks[group] = callbacks[:i] + callbacks[i + 1 :]
+        return 0
+
+    def register_group_batch_callback(
+        self, group: int, callback: Callable[[np.ndarray, np.ndarray], None]
+    ):
+        """
+        Receive group packets in batches rather than one packet at a time. No packet objects are constructed.
+        :param group: sample group id (1-6).
+        :param callback: called with (times, samples) arrays of shape (n,) and (n, n_channels).
+            These are only valid during the callback.
+        """
+        # TODO: Make this thread safe.
+        self.group_batch_callbacks[group] += (callback,)
+
+    def unregister_group_batch_callback(
+        self, group: int, callback: Callable[[np.ndarray, np.ndarray], None]
+    ) -> int:
+        callbacks = self.group_batch_callbacks[group]
+        try:
+            i = callbacks.index(callback)
+        except ValueError:
             return -1
+        self.group_batch_callbacks[group] = callbacks[:i] + callbacks[i + 1 :]
+        return 0
 
     def register_event_callback(
         self, chan_type: CBChannelType, callback: Callable[[Structure], None]
@@ -535,31 +662,73 @@ class NSPDevice(DeviceInterface):
         :param callback:
         """
         # TODO: Make this thread safe.
-        self.event_callbacks[chan_type].append(callback)
+        self.event_callbacks[chan_type] += (callback,)
+        self._update_event_dispatch()
 
     def unregister_event_callback(
         self, chan_type: CBChannelType, callback: Callable[[Structure], None]
     ) -> int:
-        if callback in self.event_callbacks[chan_type]:
-            self.event_callbacks[chan_type].remove(callback)
-            return 0
-        else:
+        callbacks = self.event_callbacks[chan_type]
+        try:
+            i = callbacks.index(callback)
+        except ValueError:
             return -1
+        self.event_callbacks[chan_type] = callbacks[:i] + callbacks[i + 1 :]
+        self._update_event_dispatch()
+        return 0
+
+    def _update_event_dispatch(self):
+        any_callbacks = self.event_callbacks[CBChannelType.Any]
+        for chan_type, callbacks in self.event_callbacks.items():
+            self.event_dispatch_callbacks[chan_type] = (
+                callbacks
+                if chan_type is CBChannelType.Any
+                else callbacks + any_callbacks
+            )
+
+    def register_event_batch_callback(
+        self,
+        chan_type: CBChannelType,
+        callback: Callable[[np.ndarray, np.ndarray, np.ndarray], None],
+    ):
+        """
+        Receive events in batches rather than one packet at a time. No packet objects are constructed.
+        :param chan_type: The type of channel the events are associated with. See CBChannelType for more info.
+        :param callback: called with (times, chids, units) arrays. These are only valid during the callback.
+        """
+        # TODO: Make this thread safe.
+        self.event_batch_callbacks[chan_type] += (callback,)
+
+    def unregister_event_batch_callback(
+        self,
+        chan_type: CBChannelType,
+        callback: Callable[[np.ndarray, np.ndarray, np.ndarray], None],
+    ) -> int:
+        callbacks = self.event_batch_callbacks[chan_type]
+        try:
+            i = callbacks.index(callback)
+        except ValueError:
+            return -1
+        self.event_batch_callbacks[chan_type] = callbacks[:i] + callbacks[i + 1 :]
+        return 0
 
     def register_config_callback(
         self, pkt_type: CBPacketType, callback: Callable[[Structure], None]
     ):
         # TODO: Make this thread safe.
-        self.config_callbacks[pkt_type].append(callback)
+        callbacks = self.config_callbacks.get(pkt_type, ())
+        self.config_callbacks[pkt_type] = callbacks + (callback,)
 
     def unregister_config_callback(
         self, pkt_type: CBPacketType, callback: Callable[[Structure], None]
     ) -> int:
-        if callback in self.config_callbacks[pkt_type]:
-            self.config_callbacks[pkt_type].remove(callback)
-            return 0
-        else:
+        callbacks = self.config_callbacks.get(pkt_type, ())
+        try:
+            i = callbacks.index(callback)
+        except ValueError:
             return -1
+        self.config_callbacks[pkt_type] = callbacks[:i] + callbacks[i + 1 :]
+        return 0
 
     # endregion
 
@@ -567,20 +736,22 @@ class NSPDevice(DeviceInterface):
     def configure(self, cfg_name, cfg_value):
         print(f"TODO: set {cfg_name} to {cfg_value}")
 
-    def _toggle_channel_ainp_flag(
-        self, chid: int, flag: int, enable: bool, timeout: float = 0
+    def _set_channel_field(
+        self, chid: int, field: str, value, pkt_type: CBPacketType, timeout: float
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.header.type = CBPacketType.CHANSETAINP
-        pkt.ainpopts &= ~flag  # Always unset first
-        pkt.ainpopts |= flag if enable else 0  # Then re-apply or not
-
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
+        """
+        Send a copy of the channel's chaninfo with one field changed, as a pkt_type packet.
+        If timeout > 0 and the reply does not arrive, re-read the config and raise.
+        """
+        pkt = _clone_struct(self._config["channel_infos"][chid])
+        setattr(pkt, field, value)
+        pkt.header.type = pkt_type
+        if not self._send_chaninfo_packet(pkt, timeout):
             self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
 
-            if pkt.ainpopts != self._config["channel_infos"][chid].ainpopts:
+            if getattr(pkt, field) != getattr(
+                self._config["channel_infos"][chid], field
+            ):
                 raise RuntimeError(
                     "Packet response contents do not match expected values."
                 )
@@ -589,31 +760,43 @@ class NSPDevice(DeviceInterface):
                     "Valid packet response NOT received, but packet contains expected values"
                 )
 
+    def _toggle_channel_ainp_flag(
+        self,
+        chid: int,
+        flag: int,
+        enable: bool,
+        timeout: float = 0,
+        mask: Optional[int] = None,
+    ):
+        """
+        Clear mask (default: flag) from the channel's ainpopts, then set flag if enable.
+        """
+        ainpopts = self._config["channel_infos"][chid].ainpopts
+        ainpopts &= ~(flag if mask is None else mask)  # Always unset first
+        ainpopts |= flag if enable else 0  # Then re-apply or not
+        self._set_channel_field(
+            chid, "ainpopts", ainpopts, CBPacketType.CHANSETAINP, timeout
+        )
+
     def _configure_channel_smpgroup(
         self, chid: int, attr_value: int, timeout: float = 0
     ):
-        if attr_value in [0, 5]:
-            # Disable raw when setting group to 0 or 5
-            self._toggle_channel_ainp_flag(
-                chid, CBAnaInpOpts.refelec_rawstream, False, timeout
-            )
-            time.sleep(0.005)
-        elif attr_value == 6:
-            # Enable raw. Note: We do not first check that 5 is not enabled.
+        if attr_value in [0, 5, 6]:
+            # Disable raw when setting group to 0 or 5; enable it for 6.
+            #  Note: We do not first check that 5 is not enabled.
             self._toggle_channel_ainp_flag(
-                chid, CBAnaInpOpts.refelec_rawstream, True, timeout
+                chid, CBAnaInpOpts.refelec_rawstream, attr_value == 6, timeout
             )
-            time.sleep(0.005)
+            # Give the device up to 5 ms to apply the AINP change before the SMP change,
+            #  but stop waiting as soon as it replies for this channel.
+            self._wait_chanreps(self._chanrep_seqs({chid}), 0.005)
 
-        pkt = copy.copy(self._config["channel_infos"][chid])
+        pkt = _clone_struct(self._config["channel_infos"][chid])
         pkt.header.type = CBPacketType.CHANSETSMP
         pkt.smpgroup = attr_value
-        # safe lowpass digital filter for smpgroups 1-4. Otherwise, disable filter.
-        pkt.smpfilter = {1: 5, 2: 6, 3: 7, 4: 10}.get(attr_value, 0)
-
-        event = self._config_events["chaninfo"] if timeout > 0 else None
+        pkt.smpfilter = _SMPGROUP_SMPFILTER.get(attr_value, 0)
 
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
+        if not self._send_chaninfo_packet(pkt, timeout):
             self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
 
             if (pkt.smpgroup != self._config["channel_infos"][chid].smpgroup) or (
@@ -630,13 +813,12 @@ class NSPDevice(DeviceInterface):
     def _configure_channel_autothreshold(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
+        pkt = _clone_struct(self._config["channel_infos"][chid])
         pkt.header.type = CBPacketType.CHANSETAUTOTHRESHOLD
         # pkt.header.dlen = cbPKTDLEN_CHANINFOSHORT
         pkt.spkopts &= ~CBAInpSpk.THRAUTO.value
         pkt.spkopts |= CBAInpSpk.THRAUTO.value if attr_value else 0
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-        self._send_packet(pkt=pkt, event=event, timeout=timeout)
+        self._send_chaninfo_packet(pkt, timeout)
 
     def _configure_channel_hoops(self, chid: int, attr_value: dict, timeout: float = 0):
         """
@@ -659,17 +841,19 @@ class NSPDevice(DeviceInterface):
                 }
                 This will set the first two hoops for unit-1.
         """
-        pkt = copy.copy(self._config["channel_infos"][chid])
+        pkt = _clone_struct(self._config["channel_infos"][chid])
         pkt.header.type = CBPacketType.CHANSETSPKHPS
 
         for unit_id, hoop_dicts in attr_value.items():
             if unit_id > MAX_UNITS:
                 # TODO: Should these also check for negative index?
                 raise IndexError(f"{unit_id} is greater than {MAX_UNITS}")
+            # Indexing spkhoops builds a new ctypes array view, so do it once per unit.
+            unit_hoops = pkt.spkhoops[unit_id - 1]
             for hoop_id, hoop in hoop_dicts.items():
                 if hoop_id > MAX_HOOPS:
                     raise IndexError(f"{hoop_id} is greater than {MAX_HOOPS}")
-                pkt.spkhoops[unit_id - 1][hoop_id - 1] = CBHoop(
+                unit_hoops[hoop_id - 1] = CBHoop(
                     valid=int(
                         hoop["enabled"] if "enabled" in hoop else hoop.get("valid", 1)
                     ),
@@ -678,17 +862,16 @@ class NSPDevice(DeviceInterface):
                     max=int(hoop["max"]),
                 )
 
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-        self._send_packet(pkt=pkt, event=event, timeout=timeout)
+        self._send_chaninfo_packet(pkt, timeout)
 
     def _configure_channel_label(self, chid: int, attr_value: str, timeout: float = 0):
-        pkt = copy.copy(self._config["channel_infos"][chid])
+        pkt = _clone_struct(self._config["channel_infos"][chid])
         pkt.header.type = CBPacketType.CHANSETLABEL
-        pkt.label = bytes(create_string_buffer(attr_value.encode("utf-8"), 16))
+        # Pad to the full field so no bytes of the old label survive after the terminator.
+        pkt.label = attr_value.encode("utf-8").ljust(16, b"\x00")
         # TODO: pkt.userflags
         # TODO: pkt.position
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
+        if not self._send_chaninfo_packet(pkt, timeout):
             self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
 
             if pkt.label != self._config["channel_infos"][chid].label:
@@ -701,47 +884,24 @@ class NSPDevice(DeviceInterface):
                 )
 
     def _configure_channel_lnc(self, chid: int, attr_value: int, timeout: float = 0):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.header.type = CBPacketType.CHANSETAINP
-        pkt.ainpopts &= ~CBAnaInpOpts.lnc_mask
-        if attr_value:
-            pkt.ainpopts |= CBAnaInpOpts.lnc_runsoft
-
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.ainpopts != self._config["channel_infos"][chid].ainpopts:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._toggle_channel_ainp_flag(
+            chid,
+            CBAnaInpOpts.lnc_runsoft,
+            bool(attr_value),
+            timeout,
+            mask=CBAnaInpOpts.lnc_mask,
+        )
 
     def _configure_channel_lnc_rate(
         self, chid: int, attr_value: int, timeout: float
     ) -> None:
-        pkt = copy.copy(self._config["channel_infos"][chid])
-
-        pkt.lncrate = LNCRate.GetLNCRate(attr_value)
-        pkt.header.type = CBPacketType.CHANSETAINP
-
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.lncrate != self._config["channel_infos"][chid].lncrate:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid,
+            "lncrate",
+            LNCRate.GetLNCRate(attr_value),
+            CBPacketType.CHANSETAINP,
+            timeout,
+        )
 
     def _set_lnc_global_config(
         self, chid: int, attr_value: int = 60, timeout: float = 0
@@ -755,19 +915,18 @@ class NSPDevice(DeviceInterface):
         pkt.lncFreq = attr_value
         pkt.lncRefChan = chid  # which channel do we look at as the ref for LNC?
         pkt.lncGlobalMode = 0  # Central sets this to zero, just doing the same here.
-        #  What is the type of event this should be configure for?
-        event = self._config_events["chaninfo"] if timeout > 0 else None
+        # LNCSET is not a channel configuration packet; the device answers with an LNCREP.
+        event = self._config_events["lnc"] if timeout > 0 else None
 
         if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
             self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
 
+            lnc = self._config["lnc"]
             if (
-                (pkt.lncFreq != self._config["channel_infos"][chid].lncFreq)
-                or (pkt.lncRefChan != self._config["channel_infos"][chid].lncRefChan)
-                or (
-                    pkt.lncGlobalMode
-                    != self._config["channel_infos"][chid].lncGlobalMode
-                )
+                lnc is None
+                or (pkt.lncFreq != lnc.lncFreq)
+                or (pkt.lncRefChan != lnc.lncRefChan)
+                or (pkt.lncGlobalMode != lnc.lncGlobalMode)
             ):
                 raise RuntimeError(
                     "Packet response contents do not match expected values."
@@ -790,128 +949,49 @@ class NSPDevice(DeviceInterface):
     def _configure_channel_spkfilter(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.spkfilter = attr_value
-        pkt.header.type = CBPacketType.CHANSETSPK
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.spkfilter != self._config["channel_infos"][chid].spkfilter:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid, "spkfilter", attr_value, CBPacketType.CHANSETSPK, timeout
+        )
 
     def _configure_spk_threshold(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.spkthrlevel = attr_value
-        pkt.header.type = CBPacketType.CHANSETSPKTHR
-
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.spkthrlevel != self._config["channel_infos"][chid].spkthrlevel:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid, "spkthrlevel", attr_value, CBPacketType.CHANSETSPKTHR, timeout
+        )
 
     def _configure_channel_analogout(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.aoutopts = attr_value
-        pkt.header.type = CBPacketType.CHANSETAOUT
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.aoutopts != self._config["channel_infos"][chid].aoutopts:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid, "aoutopts", attr_value, CBPacketType.CHANSETAOUT, timeout
+        )
 
     def _configure_channel_digital_input(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.dinpopts = attr_value
-        pkt.header.type = CBPacketType.CHANSETDINP
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.dinpopts != self._config["channel_infos"][chid].dinpopts:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid, "dinpopts", attr_value, CBPacketType.CHANSETDINP, timeout
+        )
 
     def _configure_channel_digital_output(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.doutopts = attr_value
-        pkt.header.type = CBPacketType.CHANSETDOUT
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.doutopts != self._config["channel_infos"][chid].doutopts:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid, "doutopts", attr_value, CBPacketType.CHANSETDOUT, timeout
+        )
 
     def _configure_channel_smpfilter(
         self, chid: int, attr_value: int, timeout: float = 0.0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
-        pkt.smpfilter = attr_value
-        pkt.header.type = CBPacketType.CHANSETSMP
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-
-        if not self._send_packet(pkt=pkt, event=event, timeout=timeout):
-            self.get_config(timeout=GET_CONFIG_TIMEOUT, force_refresh=True)
-
-            if pkt.smpfilter != self._config["channel_infos"][chid].smpfilter:
-                raise RuntimeError(
-                    "Packet response contents do not match expected values."
-                )
-            else:
-                raise RuntimeError(
-                    "Valid packet response NOT received, but packet contains expected values"
-                )
+        self._set_channel_field(
+            chid, "smpfilter", attr_value, CBPacketType.CHANSETSMP, timeout
+        )
 
     def _configure_channel_enable_spike(
         self, chid: int, attr_value: bool, timeout: float = 0
     ):
-        pkt = copy.copy(self._config["channel_infos"][chid])
+        pkt = _clone_struct(self._config["channel_infos"][chid])
         pkt.header.type = CBPacketType.CHANSETSPK
         pkt.spkopts &= ~CBAInpSpk.EXTRACT.value
         if attr_value:
@@ -920,9 +1000,10 @@ class NSPDevice(DeviceInterface):
             pkt.spkopts &= ~CBAInpSpk.ALLSORT.value
             pkt.spkopts |= CBAInpSpk.HOOPSORT.value
 
-        timeout = 0.1
-        event = self._config_events["chaninfo"] if timeout > 0 else None
-        self._send_packet(pkt=pkt, event=event, timeout=timeout)
+        if not self._send_chaninfo_packet(pkt, timeout):
+            logger.warning(
+                f"Channel {chid} did not acknowledge enabling/disabling spikes within {timeout} s."
+            )
 
     def configure_channel(
         self, chid: int, attr_name: str, attr_value, timeout: float = 0
@@ -936,64 +1017,165 @@ class NSPDevice(DeviceInterface):
             warning: can dramatically slow down network performance
         """
         # this won't raise an exception if the name is not valid
-        if attr_name.lower() in self._config_func_map:
-            # self._config_events["chaninfo"].clear()
-            # time.sleep(0.005)  # Sometimes setting the event is slower than the response?!
-            self._config_func_map[attr_name.lower()](chid, attr_value, timeout)
-            # self._config_events["chaninfo"].wait(timeout=0.02)
+        config_func = self._config_func_map.get(attr_name.lower())
+        if config_func is not None:
+            config_func(chid, attr_value, timeout)
         else:
             # so let the user know, TODO: raise an exception?
             print(f"{attr_name} is not a recognized name.")
 
+    def configure_channels(
+        self, chids: list[int], attr_name: str, attr_value, timeout: float = 0
+    ) -> bool:
+        """
+        Like configure_channel, but for many channels at once. The packets are sent back-to-back
+        and, if timeout > 0, we wait once for every channel to reply instead of once per channel.
+        :return: False if timeout > 0 and not all channels replied in time.
+        """
+        return self._configure_channels_batch(
+            chids,
+            lambda chid: self.configure_channel(chid, attr_name, attr_value, timeout=0),
+            timeout,
+        )
+
+    def configure_channels_spike(
+        self, chids: list[int], attr_name: str, attr_value, timeout: float = 0
+    ) -> bool:
+        """
+        Like configure_channel_spike, but for many channels at once. See configure_channels.
+        :return: False if timeout > 0 and not all channels replied in time.
+        """
+        return self._configure_channels_batch(
+            chids,
+            lambda chid: self.configure_channel_spike(
+                chid, attr_name, attr_value, timeout=0
+            ),
+            timeout,
+        )
+
+    def _configure_channels_batch(
+        self, chids: list[int], configure: Callable[[int], None], timeout: float
+    ) -> bool:
+        chids = set(chids)
+        first_seq = self._chanrep_next_seq
+        for chid in chids:
+            configure(chid)
+        if timeout <= 0 or not chids:
+            return True
+        # A chid is done only once every packet this batch sent for it has been answered;
+        #  e.g., smpgroup 0/5/6 sends both an AINP and an SMP packet.
+        seqs = self._chanrep_seqs(chids, since=first_seq)
+        if self._wait_chanreps(seqs, timeout):
+            return True
+        missing = self._forget_chanreps(seqs)
+        if not missing:
+            return True  # The last replies arrived just after the wait gave up.
+        logger.warning(
+            f"Timed out waiting for {len(missing)} of {len(chids)} channels to reply."
+        )
+        return False
+
+    def wait_config_applied(self, timeout: float = DEFAULT_TIMEOUT) -> bool:
+        """
+        Block until the device has acknowledged every channel configuration packet sent so far.
+        :return: False if some acknowledgement did not arrive within timeout.
+        """
+        seqs = self._chanrep_seqs()
+        return self._wait_chanreps(seqs, timeout) or not self._forget_chanreps(seqs)
+
+    def _chanrep_seqs(
+        self, chids: Optional[set[int]] = None, since: int = 0
+    ) -> set[int]:
+        """
+        :return: the seqs of the replies still expected for chids (None: any channel),
+            for packets sent at or after seq `since`.
+        """
+        with self._chanrep_cond:
+            return {
+                seq
+                for seq, chid in self._chanrep_pending.items()
+                if seq >= since and (chids is None or chid in chids)
+            }
+
+    def _wait_chanreps(self, seqs: set[int], timeout: float) -> bool:
+        """
+        Wait until the replies for all of seqs have arrived.
+        """
+        pending = self._chanrep_pending
+        with self._chanrep_cond:
+            return self._chanrep_cond.wait_for(
+                lambda: pending.keys().isdisjoint(seqs), timeout=timeout
+            )
+
+    def _forget_chanreps(self, seqs: set[int]) -> set[int]:
+        """
+        Stop expecting the replies for seqs, which are presumably lost,
+        so that they do not hold up later waits.
+        :return: the chids whose replies were still outstanding.
+        """
+        chids = set()
+        with self._chanrep_cond:
+            for seq in seqs:
+                chid = self._chanrep_pending.pop(seq, None)
+                if chid is None:
+                    continue
+                chids.add(chid)
+                expected = self._chanrep_expected[chid]
+                expected[:] = [_ for _ in expected if _[1] != seq]
+                if not expected:
+                    del self._chanrep_expected[chid]
+        return chids
+
     def configure_all_channels(
         self, chtype: CBChannelType, attr_name: str, attr_value, timeout: float
     ):
-        for chid, ch_info in self._config["channel_infos"].items():
-            if self._config["channel_types"][chid] == chtype:
-                self.configure_channel(chid, attr_name, attr_value, timeout)
+        chids = self.get_channels_by_type(chtype).tolist()
+        self.configure_channels(chids, attr_name, attr_value, timeout)
 
     def configure_channel_spike(
         self, chid: int, attr_name: str, attr_value: any, timeout: float = 0
     ):
-        # self._config_events["chaninfo"].clear()
-        # time.sleep(0.005)  # Sometimes setting the event is slower than the response?!
-        if attr_name.lower().startswith("enable"):
-            self._configure_channel_enable_spike(chid, attr_value, timeout)
-        elif attr_name.lower().startswith("autothresh"):
-            self._configure_channel_autothreshold(chid, attr_value, timeout)
-        elif attr_name.lower().startswith("hoops"):
-            self._configure_channel_hoops(chid, attr_value, timeout)
-        # self._config_events["chaninfo"].wait(timeout=0.02)
+        attr_name = attr_name.lower()
+        for prefix, config_func in self._spike_config_func_map.items():
+            if attr_name.startswith(prefix):
+                config_func(chid, attr_value, timeout)
+                break
 
     def configure_all_channels_spike(
         self, chtype: CBChannelType, attr_name: str, attr_value, timeout: float
     ):
-        for chid, ch_info in self._config["channel_infos"].items():
-            if self._config["channel_types"][chid] == chtype:
-                self.configure_channel_spike(chid, attr_name, attr_value, timeout)
+        chids = self.get_channels_by_type(chtype).tolist()
+        self.configure_channels_spike(chids, attr_name, attr_value, timeout)
 
     def configure_channel_disable(self, chid: int):
-        ch_pkt = copy.copy(self._config["channel_infos"][chid])
-        ch_pkt.spkopts &= ~CBAInpSpk.EXTRACT.value  # Disable spiking
-        ch_pkt.spkopts &= ~CBAInpSpk.THRAUTO.value  # Disable auto-thresholding
-        ch_pkt.ainpopts &= ~CBAnaInpOpts.refelec_offsetcorrect  # Disable DC offset
-        ch_pkt.ainpopts &= ~CBAnaInpOpts.lnc_mask  # Disable LNC
-        ch_pkt.ainpopts &= ~CBAnaInpOpts.refelec_mask  # Disable refelec_mask
-        ch_pkt.ainpopts |= ~CBAnaInpOpts.refelec_rawstream  # disable raw
+        ch_info = self._config["channel_infos"][chid]
+        # Disable spiking and auto-thresholding.
+        spkopts = ch_info.spkopts & ~_DISABLE_SPKOPTS
+        # Disable DC offset, LNC, refelec and raw.
+        ainpopts = ch_info.ainpopts & ~_DISABLE_AINPOPTS
+        if (spkopts, ainpopts, ch_info.smpgroup, ch_info.smpfilter) == (
+            ch_info.spkopts,
+            ch_info.ainpopts,
+            0,
+            0,
+        ):
+            return  # Already disabled; nothing to send.
+        ch_pkt = _clone_struct(ch_info)
+        ch_pkt.spkopts = spkopts
+        ch_pkt.ainpopts = ainpopts
         ch_pkt.smpgroup = 0
         ch_pkt.smpfilter = 0
         self.configure_channel_by_packet(ch_pkt)
 
     def configure_all_channels_disable(self, chtype: CBChannelType):
-        for chid, _type in self._config["channel_types"].items():
-            if _type == chtype:
-                self.configure_channel_disable(chid)
+        for chid in self.get_channels_by_type(chtype).tolist():
+            self.configure_channel_disable(chid)
 
     def configure_channel_by_packet(self, packet: Structure):
         # If the data were coming through serialized, we could create a fresh packet with...
         # packet = self.packet_factory.make_packet(bytes(packet))
         packet.header.type = CBPacketType.CHANSET
-        self._send_packet(packet, event=self._config_events["chaninfo"])
+        self._send_chaninfo_packet(packet, timeout=0.005)
 
     def get_config(
         self, timeout: Optional[float] = None, force_refresh: bool = True
@@ -1002,58 +1184,104 @@ class NSPDevice(DeviceInterface):
         See CereLink cbCFGBUFF and how/where this gets filled.
         """
         if force_refresh:
-            # Clear out our existing config
-            self._config["proc_chans"] = 0
-            self._config["channel_infos"] = {}
-            self._config["sysfreq"] = None
-            time.sleep(0.1)
-            pkt = self.packet_factory.make_packet(
-                None,
-                chid=CBSpecialChan.CONFIGURATION,
-                pkt_type=CBPacketType.REQCONFIGALL,
-            )
-            pkt.header.time = 1
-            pkt.header.dlen = 0
-            # REQCONFIGALL packet should trigger a cascade (see main.c recv_pkt):
-            #  1. echo back the REQCONFIGALL packet
-            #  2. PROCINFO --> .chancount can tell us how many channels to expect.
-            #  3-4. SS_DETECT, SS_ARTIF_REJECT
-            #  5. n_chans * SS_NOISE_BOUNDARY
-            #  6-7. SS_STATISTICS, SS_STATUS
-            #  8. 6 * GROUPINFO
-            #  9. 12 * FILTINFO
-            # 10. b (14) * BANKINFO
-            # 11. n_chans * CHANINFO
-            # 12. n_chans * NTRODEINFO
-            # 13. n_chans * 2 * SS_MODELSET
-            # 14. LNC
-            # 15. FILECFG
-            # 16. SYSINFO
-            # We wait on the final SYSINFO packet. Unfortunately this is commonly dropped,
-            #  especially if we are slow to handle the preceding packets.
-            #  But we can still return success if we got all the chaninfo packets.
-            if not self._send_packet(
-                pkt, event=self._config_events["sysrep"], timeout=timeout
-            ):
-                logger.debug("Did not receive final response to REQCONFIGALL.")
-            n_infos = len(self._config["channel_infos"])
-            if self._config["proc_chans"] == 0 or n_infos != self._config["proc_chans"]:
-                logger.warning(
-                    f"Received incomplete response to REQCONFIGALL "
-                    f"({n_infos} / {self._config['proc_chans']} CHANINFOS)."
+            if self._config_refresh_lock.acquire(blocking=False):
+                try:
+                    b_complete = self._request_config(timeout)
+                finally:
+                    self._config_refresh_lock.release()
+            else:
+                # Another thread's REQCONFIGALL is already in flight. Share its result instead of
+                #  clearing the config mid-cascade and making the device send it all again.
+                with self._config_refresh_lock:
+                    pass
+                n_chans = self._config["proc_chans"]
+                b_complete = (
+                    n_chans > 0 and len(self._config["channel_infos"]) == n_chans
                 )
+            if not b_complete:
                 return None
-            else:
-                logger.info(f"Received {self._config['proc_chans']} CHANINFO packets.")
         return self.config.copy()
 
+    def _request_config(self, timeout: Optional[float]) -> bool:
+        """
+        Clear our config and request the device's full config with REQCONFIGALL.
+        :return: True if all the CHANINFO packets arrived.
+        """
+        # Clear out our existing config
+        self._config["proc_chans"] = 0
+        self._config["channel_infos"] = {}
+        self._chids_by_type = None
+        self._config["sysfreq"] = None
+        pkt = self.packet_factory.make_packet(
+            None,
+            chid=CBSpecialChan.CONFIGURATION,
+            pkt_type=CBPacketType.REQCONFIGALL,
+        )
+        pkt.header.time = 1
+        pkt.header.dlen = 0
+        # REQCONFIGALL packet should trigger a cascade (see main.c recv_pkt):
+        #  1. echo back the REQCONFIGALL packet
+        #  2. PROCINFO --> .chancount can tell us how many channels to expect.
+        #  3-4. SS_DETECT, SS_ARTIF_REJECT
+        #  5. n_chans * SS_NOISE_BOUNDARY
+        #  6-7. SS_STATISTICS, SS_STATUS
+        #  8. 6 * GROUPINFO
+        #  9. 12 * FILTINFO
+        # 10. b (14) * BANKINFO
+        # 11. n_chans * CHANINFO
+        # 12. n_chans * NTRODEINFO
+        # 13. n_chans * 2 * SS_MODELSET
+        # 14. LNC
+        # 15. FILECFG
+        # 16. SYSINFO
+        # We wait on the final SYSINFO packet. Unfortunately this is commonly dropped,
+        #  especially if we are slow to handle the preceding packets.
+        #  But we can still return success if we got all the chaninfo packets.
+        if not self._send_packet(
+            pkt, event=self._config_events["sysrep"], timeout=timeout
+        ):
+            logger.debug("Did not receive final response to REQCONFIGALL.")
+        n_infos = len(self._config["channel_infos"])
+        if self._config["proc_chans"] == 0 or n_infos != self._config["proc_chans"]:
+            logger.warning(
+                f"Received incomplete response to REQCONFIGALL "
+                f"({n_infos} / {self._config['proc_chans']} CHANINFOS)."
+            )
+            return False
+        logger.info(f"Received {self._config['proc_chans']} CHANINFO packets.")
+        return True
+
+    def get_channels_by_type(self, chtype: CBChannelType) -> np.ndarray:
+        """
+        :return: sorted (read-only) array of the 1-based chids whose channel type is chtype.
+            Only channels whose chaninfo we have are included.
+        """
+        chids_by_type = self._chids_by_type
+        if chids_by_type is None:
+            # After a partial config refresh, channel_types may list chids missing from channel_infos.
+            channel_types = self._config["channel_types"]
+            grouped = {}
+            for chid in sorted(self._config["channel_infos"]):
+                grouped.setdefault(channel_types.get(chid), []).append(chid)
+            chids_by_type = {}
+            for _type, chids in grouped.items():
+                chids_by_type[_type] = np.array(chids, dtype=np.uint16)
+                chids_by_type[_type].flags.writeable = False
+            self._chids_by_type = chids_by_type
+        return chids_by_type.get(chtype, np.empty(0, dtype=np.uint16))
+
     def set_nplay_state(
         self,
         val: int = 0,
         mode: CBNPlayMode = CBNPlayMode.NONE,
         flag: CBNPlayFlag = CBNPlayFlag.NONE,
         speed: float = 1,
-    ):
+        timeout: float = 0,
+    ) -> bool:
+        """
+        :param timeout: if > 0, wait up to this long for the NPLAYREP acknowledging the change.
+        :return: False if timeout > 0 and no NPLAYREP arrived in time.
+        """
         pkt = self.packet_factory.make_packet(bytes(self._config["nplay"]))
         # pkt = self.packet_factory.make_packet(None,
         #                                       chid=CBSpecialChan.CONFIGURATION,
@@ -1065,7 +1293,8 @@ class NSPDevice(DeviceInterface):
         pkt.speed = speed
         # if 'nplay' in self._config and self._config['nplay'] is not None:
         #     pkt.fname = self._config['nplay'].fname
-        self._send_packet(pkt)
+        event = self._config_events["nplay"] if timeout > 0 else None
+        return self._send_packet(pkt, event=event, timeout=timeout)
 
     def set_runlevel(
         self, run_level: CBRunLevel, timeout: Optional[float] = None
@@ -1148,10 +1377,14 @@ class NSPDevice(DeviceInterface):
             self._device_addr,
             self._params.protocol,
             self._params.recv_bufsize,
+            busy_poll_us=self._params.busy_poll_us,
+            pin_cpu=self._params.pin_cpu,
+            recv_priority=self._params.recv_priority,
         )
         self._io_thread.start()
         # _io_thread.start() returns immediately but takes a few moments until its send_q is created.
-        time.sleep(0.5)
+        if not self._io_thread.wait_until_ready(timeout=0.5):
+            logger.warning("IO thread did not start within 0.5 s.")
 
         err = CBError.NONE
         runlevel = 0
@@ -1217,19 +1450,41 @@ class NSPDevice(DeviceInterface):
 
         if self._config["nplay"] is not None:
             # 1. (skip) mode=CBNPlayMode.PATH, fname=folder_path.
+            # Each step waits for nPlay's NPLAYREP, bounded by the delays we used to sleep for.
             # 2. mode=CBNPlayMode.NONE, speed=1, fname=filename. These are the default settings.
-            self.set_nplay_state()
-            time.sleep(0.2)
+            self.set_nplay_state(timeout=0.2)
             # 3. Unpause: mode=CBNPlayMode.PAUSE, val=0, speed=1
-            self.set_nplay_state(val=0, mode=CBNPlayMode.PAUSE)
-            time.sleep(0.1)
+            self.set_nplay_state(val=0, mode=CBNPlayMode.PAUSE, timeout=0.1)
             # 4. mode=CBNPlayMode.SINGLE, val=0, speed=0??
-            self.set_nplay_state(val=0, mode=CBNPlayMode.SINGLE, speed=0)
-            time.sleep(0.1)
+            self.set_nplay_state(val=0, mode=CBNPlayMode.SINGLE, speed=0, timeout=0.1)
             # set unpause
 
         return CBError.NONE
 
+    def _send_chaninfo_packet(self, pkt, timeout: float) -> bool:
+        """
+        Send a channel configuration packet and note the reply it should get.
+        If timeout > 0, wait that long for that reply, and stop expecting it if it does not arrive.
+        """
+        chid = pkt.chan
+        # The device answers each CHANSETxxx with the matching CHANREPxxx: the same type without 0x80.
+        with self._chanrep_cond:
+            seq = self._chanrep_next_seq
+            self._chanrep_next_seq = seq + 1
+            self._chanrep_expected.setdefault(chid, []).append(
+                (pkt.header.type & 0x7F, seq)
+            )
+            self._chanrep_pending[seq] = chid
+        self._send_packet(pkt=pkt)
+        if (
+            timeout > 0
+            and not self._wait_chanreps({seq}, timeout)
+            and self._forget_chanreps({seq})
+        ):
+            logger.debug("timeout expired waiting for chaninfo reply")
+            return False
+        return True
+
     def _send_packet(
         self, pkt, event: Optional[threading.Event] = None, timeout=0.005
     ) -> bool:
@@ -1237,7 +1492,9 @@ class NSPDevice(DeviceInterface):
         Touch-up packet and enqueue for sender thread.
         Called by configure and _startup_sequence.
         """
-        pkt.header.time = pkt.header.time or self.last_time
+        # Each pkt.header access builds a new ctypes object, so read it once.
+        header = pkt.header
+        header.time = header.time or self.last_time
         send_bytes = bytes(pkt)
         # The firmware truncates its struct sizes to a multiple of 4-bytes and will complain if we send
         #  something too big.
@@ -1245,15 +1502,16 @@ class NSPDevice(DeviceInterface):
         n_send = n_bytes - n_bytes % 4
         if n_send != n_bytes:
             logger.debug("Truncating packet with nbytes not a multiple of 4.")
-        send_bytes = send_bytes[:n_send]
-        if event is not None:
-            event.clear()
+            send_bytes = send_bytes[:n_send]
+        if event is None:
+            # Fire-and-forget.
+            self._io_thread.send(send_bytes)
+            return True
+        event.clear()
         self._io_thread.send(send_bytes)
-        if event is not None:
-            res = event.wait(timeout=timeout)
-            if not res:
-                logger.debug("timeout expired waiting for event")
-                return False
+        if not event.wait(timeout=timeout):
+            logger.debug("timeout expired waiting for event")
+            return False
         return True
 
     # endregion
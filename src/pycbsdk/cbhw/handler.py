@@ -1,10 +1,13 @@
+from collections import deque
 import logging
-import queue
 import struct
 import threading
 
+import numpy as np
+
 from .device.base import DeviceInterface
 from .packet.factory import CBPacketFactory
+from .packet.pool import PacketPool
 from .packet.common import CBSpecialChan, CBChannelType
 
 
@@ -13,11 +16,94 @@ logger = logging.getLogger(__name__)
 
 debug_unrecognized_packets = set()
 debug_packet_counter = [0]
+EVENT_BATCH_SIZE = 64
+GROUP_BATCH_SIZE = 32
+# Plain ints for the per-packet checks in PacketHandlerThread.run;
+#  looking up and comparing IntEnum members costs several times more than int ops.
+_GROUP_CHID = int(CBSpecialChan.GROUP)
+_CONFIG_CHID = int(CBSpecialChan.CONFIGURATION)
+# First two int16 samples of a group packet, for the out-of-order diagnostics.
+_unpack_group_head = struct.Struct("<hh").unpack_from
+
+
+class EventBatch:
+    """
+    Struct-of-arrays accumulator of event packet headers for batch callbacks.
+    Callbacks receive views onto the batch arrays, which are reused after the callback returns.
+    """
+
+    def __init__(self, size: int = EVENT_BATCH_SIZE):
+        self.times = np.empty(size, dtype=np.int64)
+        self.chids = np.empty(size, dtype=np.uint16)
+        self.units = np.empty(size, dtype=np.uint16)
+        self.n = 0
+
+    def append(self, pkt_time: int, chid: int, unit: int) -> bool:
+        """
+        :return: True if the batch is full and should be flushed.
+        """
+        n = self.n
+        self.times[n] = pkt_time
+        self.chids[n] = chid
+        self.units[n] = unit
+        self.n = n + 1
+        return self.n == len(self.times)
+
+    def flush(self, callbacks) -> None:
+        n = self.n
+        self.n = 0
+        for cb in callbacks:
+            cb(self.times[:n], self.chids[:n], self.units[:n])
+
+
+class GroupBatch:
+    """
+    Accumulates the timestamps and samples of consecutive group packets for batch callbacks.
+    Callbacks receive (times, samples) views onto the batch buffers, which are reused after the callback returns.
+    samples has shape (n_packets, n_channels); n_channels may include one padding channel.
+    """
+
+    def __init__(self, header_size: int, size: int = GROUP_BATCH_SIZE):
+        self._header_size = header_size
+        self.times = np.empty(size, dtype=np.int64)
+        self._raw = bytearray()
+        self._row_bytes = -1
+        self.n = 0
+
+    def add(self, pkt_time: int, data: bytes, callbacks) -> None:
+        """
+        Add a packet. The batch is flushed to callbacks when it is full, or beforehand if this packet's
+        channel count differs from the batched ones (i.e., the group's configuration changed).
+        """
+        row_bytes = len(data) - self._header_size
+        if row_bytes != self._row_bytes:
+            self.flush(callbacks)
+            self._row_bytes = row_bytes
+            self._raw = bytearray(len(self.times) * row_bytes)
+        n = self.n
+        self.times[n] = pkt_time
+        self._raw[n * row_bytes : (n + 1) * row_bytes] = data[self._header_size :]
+        self.n = n + 1
+        if self.n == len(self.times):
+            self.flush(callbacks)
+
+    def flush(self, callbacks) -> None:
+        n = self.n
+        if n == 0:
+            return
+        self.n = 0
+        samples = np.frombuffer(
+            self._raw, dtype=np.int16, count=n * self._row_bytes // 2
+        ).reshape(n, -1)
+        for cb in callbacks:
+            cb(self.times[:n], samples)
 
 
 class PacketHandlerThread(threading.Thread):
     """
     receiver_queue is filled with packets by the IO system.
+    It is a deque used as a single-producer/single-consumer FIFO: the IO thread only appends
+    and this thread only pops from the left. Both are atomic, so no lock is needed.
     Retrieved packets are used to update device state,
     and to call the registered callback functions.
     Both state updates and callbacks must be threadsafe
@@ -26,86 +112,120 @@ class PacketHandlerThread(threading.Thread):
 
     def __init__(self, device: DeviceInterface, **kwargs):
         super().__init__(**kwargs)
-        self._recv_q = queue.SimpleQueue()
+        self._recv_q = deque()
         self._device = device
         self._continue = False
-        self._packet_factory = CBPacketFactory(protocol=device._params.protocol)
+        n_pool = device._params.packet_pool_size
+        self._packet_factory = CBPacketFactory(
+            protocol=device._params.protocol,
+            pool=PacketPool(n_slots=n_pool) if n_pool > 0 else None,
+        )
         self._stop_event = threading.Event()
         self.daemon = True
 
     @property
-    def receiver_queue(self) -> queue.SimpleQueue:
+    def receiver_queue(self) -> deque:
         return self._recv_q
 
+    def _flush_batches(self, event_batches: dict, group_batches: dict) -> None:
+        for chantype, batch in event_batches.items():
+            if batch.n:
+                batch.flush(self._device.event_batch_callbacks[chantype])
+        for group, batch in group_batches.items():
+            if batch.n:
+                batch.flush(self._device.group_batch_callbacks[group])
+
     def run(self) -> None:
         last_group_time = -1
         last_group_data = None
+        event_batches = {_: EventBatch() for _ in CBChannelType}
+        group_batches = {
+            _: GroupBatch(self._packet_factory.header_size)
+            for _ in self._device.group_batch_callbacks
+        }
+        popleft = self._recv_q.popleft
+        chantype_any = CBChannelType.Any
+        device = self._device
+        make_packet = self._packet_factory.make_packet
+        # (Un)registering a callback replaces a value in these dicts, never the dicts themselves,
+        #  so they can be bound once here.
+        channel_types = device.config["channel_types"]
+        config_callbacks = device.config_callbacks
+        group_callbacks = device.group_callbacks
+        group_raw_callbacks = device.group_raw_callbacks
+        group_batch_callbacks = device.group_batch_callbacks
+        event_dispatch_callbacks = device.event_dispatch_callbacks
+        event_batch_callbacks = device.event_batch_callbacks
         while True:
             try:
-                pkt_tuple = self._recv_q.get(block=False)
-            except queue.Empty:
-                # Queue was empty
+                pkt_tuple = popleft()
+            except IndexError:
+                # Queue was empty. Hand off partial batches before waiting.
+                self._flush_batches(event_batches, group_batches)
                 if self._stop_event.wait(0.001):
                     break
                 else:
                     continue
-            pkt_time, chid, pkt_type, dlen, data = pkt_tuple
-            self._device.pkts_received += 1
+            pkt_time, chid, pkt_type, _dlen, data = pkt_tuple
+            device.pkts_received += 1
 
             # Update device state
-            if pkt_time > self._device.last_time:
-                self._device.last_time = pkt_time
-                if chid == CBSpecialChan.GROUP and pkt_type == 6:
+            if pkt_time > device.last_time:
+                device.last_time = pkt_time
+                if chid == _GROUP_CHID and pkt_type == 6:
                     last_group_time = pkt_time
-                    last_group_data = struct.unpack("<hh", data[:4])
-            elif (
-                chid == CBSpecialChan.GROUP
-                and pkt_type == 6
-                and pkt_time < last_group_time
-            ):
+                    last_group_data = _unpack_group_head(data)
+            elif chid == _GROUP_CHID and pkt_type == 6 and pkt_time < last_group_time:
                 logger.warning(
                     f"Packets out of order. "
                     f"last: {last_group_time}"
                     f";\t\tlast data: {last_group_data}"
                     f";\t\tnew: {pkt_time}"
-                    f";\t\tnew data: {struct.unpack('<hh', data[:4])}"
+                    f";\t\tnew data: {_unpack_group_head(data)}"
                     f";\t\tdelta t: {(pkt_time - last_group_time) / 1e9}"
                     f";\t\tpkt type: {pkt_type}"
-                    f";\t\tpkts seen: {self._device.pkts_received}"
+                    f";\t\tpkts seen: {device.pkts_received}"
                 )
 
-            # Get the channel type for this channel. Note that we will only have meaningful chantype values for channels
-            #  that returned a chaninfo (see _handle_chaninfo). For all other chids (i.e., `0` and `0x8000`) we will get
-            #  the default value: ANY; this packet does not belong to a single channel.
-            chantype = self._device.config["channel_types"][chid]
+            # Config and group packets do not belong to a single channel; their chantype is ANY.
+            chantype = chantype_any
 
             b_debug_unknown = True  # If there are no callbacks and it's not a group or event packet, then debug.
 
             # See if we have any callbacks registered for this type of packet.
-            if chid & CBSpecialChan.CONFIGURATION:
-                callbacks = self._device.config_callbacks[pkt_type]
-            elif chid == CBSpecialChan.GROUP:
+            if chid & _CONFIG_CHID:
+                callbacks = config_callbacks.get(pkt_type, ())
+            elif chid == _GROUP_CHID:
                 # This is a sample group packet. The pkt_type is actually the sample group id (1-6)
-                if pkt_type in self._device.group_callbacks:
-                    callbacks = self._device.group_callbacks[pkt_type]
+                if pkt_type in group_callbacks:
+                    for raw_cb in group_raw_callbacks[pkt_type]:
+                        raw_cb(pkt_time, data)
+                    batch_callbacks = group_batch_callbacks[pkt_type]
+                    if batch_callbacks:
+                        group_batches[pkt_type].add(pkt_time, data, batch_callbacks)
+                    callbacks = group_callbacks[pkt_type]
                 else:
                     # Known bug https://blackrockengineering.atlassian.net/browse/CSCI-95
                     callbacks = None
                 b_debug_unknown = False
             else:
-                callbacks = self._device.event_callbacks[chantype]
-                if chantype != CBChannelType.Any:
-                    callbacks += self._device.event_callbacks[CBChannelType.Any]
+                # Note that we will only have meaningful chantype values for channels that returned a chaninfo
+                #  (see _handle_chaninfo). Other chids get the default value: ANY.
+                chantype = channel_types.get(chid, chantype_any)
+                callbacks = event_dispatch_callbacks[chantype]
                 b_debug_unknown = False
+                batch_callbacks = event_batch_callbacks[chantype]
+                if batch_callbacks and event_batches[chantype].append(
+                    pkt_time, chid, pkt_type
+                ):
+                    event_batches[chantype].flush(batch_callbacks)
 
             # Only bother to construct the packet if we have a callback registered.
             # Note: the NSPDevice registers some of its own callbacks to handle config packets it is monitoring.
             #  See _register_basic_callbacks.
             #  Otherwise, a callback will only be registered if client code called register_XXX_callback
             if callbacks:
-                pkt = self._packet_factory.make_packet(
-                    data, chid=chid, pkt_type=pkt_type, chantype=chantype
-                )
+                pkt = make_packet(data, chid, pkt_type, chantype)
                 # Between the time the callbacks are grabbed above and the time we actually call them,
                 #  it's possible for the client to unregister the callback.
                 # Thus it's very important that a callback is unregistered and some time is allowed to pass
@@ -115,9 +235,7 @@ class PacketHandlerThread(threading.Thread):
                     cb(pkt)
             elif b_debug_unknown:
                 # We can use this to debug receiving packet types we are unfamiliar with.
-                pkt = self._packet_factory.make_packet(
-                    data, chid=chid, pkt_type=pkt_type, chantype=chantype
-                )
+                pkt = make_packet(data, chid, pkt_type, chantype)
                 self.warn_unhandled(pkt)
 
         del self._recv_q
@@ -132,9 +250,7 @@ class PacketHandlerThread(threading.Thread):
         if (debug_packet_counter[0] % 100) == 0:
             logger.warning(f"Received {debug_packet_counter[0]}'th unhandled packet.")
 
-        _old = len(debug_unrecognized_packets)
-        debug_unrecognized_packets.add(pkt.header.type)
-        if len(debug_unrecognized_packets) > _old:
-            logger.warning(
-                f"Received unhandled packet with type {hex(pkt.header.type)}"
-            )
+        pkt_type = pkt.header.type
+        if pkt_type not in debug_unrecognized_packets:
+            debug_unrecognized_packets.add(pkt_type)
+            logger.warning(f"Received unhandled packet with type {hex(pkt_type)}")
@@ -1,8 +1,9 @@
 import asyncio
+from collections import deque
 import logging
-import queue
+import os
 import socket
-import struct
+import sys
 import threading
 from typing import Optional, Tuple
 
@@ -13,6 +14,119 @@ from .base import CerebusCommInterface
 logger = logging.getLogger(__name__)
 
 
+RECV_BUFFER_SIZE = 1 << 16  # Large enough for any UDP datagram.
+RECV_MAX_BATCH = 64  # Max datagrams drained per socket wakeup, so the sender coroutine isn't starved.
+RECV_BUFSIZE_FLOOR = 1 << 16
+# Linux socket options; not every Python build exposes these constants.
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46)
+SO_INCOMING_CPU = getattr(socket, "SO_INCOMING_CPU", 49)
+SO_RCVBUFFORCE = getattr(socket, "SO_RCVBUFFORCE", 33)
+THREAD_PRIORITY_TIME_CRITICAL = 15  # Windows
+
+
+def set_recv_bufsize(sock: socket.socket, requested: int) -> int:
+    """
+    Request a socket receive buffer of `requested` bytes, halving on refusal, and warn if
+    the OS granted less than requested.
+    On Linux, SO_RCVBUFFORCE is tried first; it ignores net.core.rmem_max but needs CAP_NET_ADMIN.
+    :return: the effective buffer size in bytes.
+    """
+    bufsize = requested
+    b_forced = False
+    if sys.platform == "linux":
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_RCVBUFFORCE, bufsize)
+            b_forced = True
+        except OSError:
+            pass  # Unprivileged. Fall back to SO_RCVBUF.
+    while not b_forced:
+        try:
+            # macOS refuses (ENOBUFS) sizes above kern.ipc.maxsockbuf; Linux silently caps at rmem_max.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, bufsize)
+            break
+        except OSError:
+            if bufsize // 2 < RECV_BUFSIZE_FLOOR:
+                break
+            bufsize //= 2
+    effective = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if sys.platform == "linux":
+        # Linux reports double the usable size to account for bookkeeping.
+        effective //= 2
+    if effective < requested:
+        hint = {
+            "linux": f" Try `sudo sysctl -w net.core.rmem_max={requested}`.",
+            "darwin": f" Try `sudo sysctl -w kern.ipc.maxsockbuf={2 * requested}`.",
+        }.get(sys.platform, "")
+        logger.warning(
+            f"Socket receive buffer is {effective} bytes; requested {requested}.{hint}"
+        )
+    else:
+        logger.debug(f"Socket receive buffer is {effective} bytes.")
+    return effective
+
+
+def set_low_latency_opts(
+    sock: socket.socket, busy_poll_us: int = 0, pin_cpu: Optional[int] = None
+) -> None:
+    """
+    Optionally enable kernel busy-polling on the socket and pin the calling thread (and the socket's
+    packet processing) to a single CPU. Linux only; failures are logged, not raised.
+    """
+    if busy_poll_us <= 0 and pin_cpu is None:
+        return
+    if sys.platform != "linux":
+        logger.warning(
+            "busy_poll_us and pin_cpu are only supported on Linux; ignoring."
+        )
+        return
+    if busy_poll_us > 0:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, busy_poll_us)
+        except OSError as e:
+            logger.warning(
+                f"Could not set SO_BUSY_POLL={busy_poll_us} (needs CAP_NET_ADMIN?): {e}"
+            )
+    if pin_cpu is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_INCOMING_CPU, pin_cpu)
+            os.sched_setaffinity(0, {pin_cpu})  # 0: the calling thread.
+        except OSError as e:
+            logger.warning(f"Could not pin receive thread to CPU {pin_cpu}: {e}")
+
+
+def set_thread_priority(priority: Optional[int]) -> None:
+    """
+    Raise the calling thread's scheduling priority so it is not descheduled while packets pile up.
+    On Linux, use SCHED_FIFO with the given priority (1-99); this needs CAP_SYS_NICE.
+    On Windows, the value is ignored and the thread is set to THREAD_PRIORITY_TIME_CRITICAL.
+    Failures are logged, not raised.
+    """
+    if priority is None:
+        return
+    if sys.platform == "linux":
+        try:
+            # 0: the calling thread.
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (OSError, ValueError) as e:
+            logger.warning(
+                f"Could not set SCHED_FIFO priority {priority} (needs CAP_SYS_NICE?): {e}"
+            )
+    elif sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.SetThreadPriority(
+            kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL
+        ):
+            logger.warning(
+                f"Could not raise receive thread priority: error {kernel32.GetLastError()}"
+            )
+    else:
+        logger.warning(
+            "recv_priority is only supported on Linux and Windows; ignoring."
+        )
+
+
 class FlexiQueue:
     """
     https://stackoverflow.com/a/59650685
@@ -23,7 +137,8 @@ class FlexiQueue:
         self._queue = asyncio.Queue()
 
     def sync_put_nowait(self, item):
-        self._loop.call_soon(self._queue.put_nowait, item)
+        # Callbacks scheduled this way run in FIFO order, so items stay in order.
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
 
     def sync_put(self, item):
         asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
@@ -46,19 +161,36 @@ class CerebusDatagramProtocol(asyncio.DatagramProtocol):
         self,
         on_con_lost: asyncio.Future,
         protocol: str,
-        receiver_queue: queue.SimpleQueue,
+        receiver_queue: deque,
     ):
         self._on_con_lost = on_con_lost
         self._packet_factory = CBPacketFactory(protocol=protocol)  # Just for the header
+        self._header_struct = self._packet_factory.header_cls.HEADER_STRUCT
         self._recv_queue = receiver_queue
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
 
     def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
-        hdr_tuples_data = self._process_datagram(data)
-        for hdr_tuple in hdr_tuples_data:
-            pkt_time, chid, pkt_type, dlen = hdr_tuple[:4]
-            # v4 has instrument and reserved in hdr_tuple[4:6]
-            data = hdr_tuple[-1]
-            self._recv_queue.put((pkt_time, chid, pkt_type, dlen, data))
+        self._enqueue_packets(data)
+
+    def sock_readable(self, sock: socket.socket) -> None:
+        """
+        Drain pending datagrams into a single reused buffer with `recvmsg_into`.
+        Used instead of the transport's one-`recvfrom`-per-wakeup reader where supported.
+        """
+        recvmsg_into = sock.recvmsg_into
+        buffers = [self._recv_buf]
+        for _ in range(RECV_MAX_BATCH):
+            try:
+                n_bytes, _, msg_flags, addr = recvmsg_into(buffers)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                self.error_received(exc)
+                return
+            if msg_flags & socket.MSG_TRUNC:
+                logger.warning(f"Datagram from {addr} truncated to {n_bytes} bytes.")
+            self._enqueue_packets(self._recv_view[:n_bytes])
 
     def error_received(self, exc: Exception) -> None:
         logger.error(f"Error received: {exc}")
@@ -71,21 +203,65 @@ class CerebusDatagramProtocol(asyncio.DatagramProtocol):
         except asyncio.InvalidStateError:
             logger.warning("Connection future already set.")
 
-    def _process_datagram(self, data: bytes) -> list[int, int, int, bytes]:
+    def _enqueue_packets(self, data: bytes) -> None:
         """
-        :param data:
-        :return: a list of (chid, pkt_type, pkt_data) tuples
+        Split a datagram into packets and put a (pkt_time, chid, pkt_type, dlen, pkt_bytes) tuple
+        for each onto the receiver queue.
+        :param data: datagram bytes. May be a memoryview onto a reused buffer; packet bytes are copied out.
         """
-        #
-        known_tuples = []
-        header_size = self._packet_factory.header_size
-        header_format = self._packet_factory.header_cls.HEADER_FORMAT
-        while len(data) >= header_size:
-            header_tuple = struct.unpack(header_format, data[:header_size])
-            dlen = header_tuple[3]
-            known_tuples.append(header_tuple + (data[: header_size + dlen * 4],))
-            data = data[header_size + dlen * 4 :]
-        return known_tuples
+        put = self._recv_queue.append
+        unpack_from = self._header_struct.unpack_from
+        header_size = self._header_struct.size
+        n_data = len(data)
+        offset = 0
+        while n_data - offset >= header_size:
+            # v4 has instrument and reserved after dlen; these are not forwarded.
+            pkt_time, chid, pkt_type, dlen = unpack_from(data, offset)[:4]
+            pkt_end = offset + header_size + dlen * 4
+            put((pkt_time, chid, pkt_type, dlen, bytes(data[offset:pkt_end])))
+            offset = pkt_end
+
+
+class RecvIntoDatagramTransport(asyncio.DatagramTransport):
+    """
+    Minimal datagram transport for selector event loops. On each wakeup, the protocol drains
+    the socket with `recvmsg_into` (see `CerebusDatagramProtocol.sock_readable`) instead of
+    the single `recvfrom` that asyncio's datagram transport does.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sock: socket.socket,
+        protocol: "CerebusDatagramProtocol",
+    ):
+        super().__init__()
+        self._loop = loop
+        self._sock = sock
+        self._protocol = protocol
+        self._closing = False
+        self._protocol.connection_made(self)
+        self._loop.add_reader(self._sock.fileno(), protocol.sock_readable, self._sock)
+
+    def sendto(self, data, addr=None) -> None:
+        try:
+            self._sock.sendto(data, addr)
+        except OSError as exc:
+            self._protocol.error_received(exc)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        # May be called from outside the loop thread (see CerebusDatagramThread.stop).
+        if not self._closing:
+            self._closing = True
+            self._loop.call_soon_threadsafe(self._close)
+
+    def _close(self) -> None:
+        self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._protocol.connection_lost(None)
 
 
 class CerebusDatagramThread(threading.Thread, CerebusCommInterface):
@@ -95,11 +271,14 @@ class CerebusDatagramThread(threading.Thread, CerebusCommInterface):
 
     def __init__(
         self,
-        receiver_queue: queue.SimpleQueue,
+        receiver_queue: deque,
         receiver_interface_addr: Tuple[str, int],
         device_interface_addr: Tuple[str, int],
         protocol_version: str,
         buff_size: int,
+        busy_poll_us: int = 0,
+        pin_cpu: Optional[int] = None,
+        recv_priority: Optional[int] = None,
     ):
         super().__init__()
         self._recv_q = receiver_queue
@@ -107,15 +286,22 @@ class CerebusDatagramThread(threading.Thread, CerebusCommInterface):
         self._dev_addr = device_interface_addr
         self._proto_ver = protocol_version
         self._buff_size = buff_size
+        self._busy_poll_us = busy_poll_us
+        self._pin_cpu = pin_cpu
+        self._recv_priority = recv_priority
         self._send_q: Optional[FlexiQueue] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._transport: Optional[asyncio.transports.BaseTransport] = None
+        self._transport_ready: Optional[asyncio.Event] = None
+        self._ready = threading.Event()  # Set once send() can accept bytes.
         self.daemon = True
 
     def run(self) -> None:
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
         self._send_q = FlexiQueue(self._loop)
+        self._transport_ready = asyncio.Event()
+        self._ready.set()
         self._loop.run_until_complete(
             asyncio.gather(self._receiver_coro(), self._sender_coro())
         )
@@ -125,16 +311,24 @@ class CerebusDatagramThread(threading.Thread, CerebusCommInterface):
         self._transport.close()
         self.send("quit")
 
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the thread is running and send() can queue bytes.
+        Bytes queued before the socket is bound are sent as soon as it is.
+        :return: False if the thread did not get ready within timeout.
+        """
+        return self._ready.wait(timeout=timeout)
+
     def send(self, send_bytes):
         """
-        Called by main thread.
+        Called by main thread. Does not wait for the IO thread to pick up the bytes.
         """
         if self._send_q is None:
             logger.error(
                 "Cannot send bytes to devices because the io thread is not running"
             )
             return
-        self._send_q.sync_put(send_bytes)
+        self._send_q.sync_put_nowait(send_bytes)
 
     async def _receiver_coro(self):
         # Create socket
@@ -142,7 +336,7 @@ class CerebusDatagramThread(threading.Thread, CerebusCommInterface):
             family=socket.AF_INET, type=socket.SOCK_DGRAM, proto=socket.IPPROTO_UDP
         )
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_DONTROUTE, True)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._buff_size)
+        set_recv_bufsize(sock, self._buff_size)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
         # sock.settimeout(10)
         # sock.setblocking(False)
@@ -153,27 +347,44 @@ class CerebusDatagramThread(threading.Thread, CerebusCommInterface):
                 f"Cannot bind to {self._recv_addr}. Central may have exclusive access to the port on "
                 f"this machine. Error: {e}"
             )
+        # We are on the IO thread, so this pins the thread that drains the socket.
+        set_low_latency_opts(sock, self._busy_poll_us, self._pin_cpu)
+        set_thread_priority(self._recv_priority)
 
         loop = asyncio.get_event_loop()
         # Create a future that should only return when the UDP connection is lost
         conn_lost_future = loop.create_future()
         # Create the UDP connection. Upon connection, it will invoke the NSPProtocol.
-        self._transport, protocol = await loop.create_datagram_endpoint(
-            lambda: CerebusDatagramProtocol(
-                conn_lost_future, self._proto_ver, self._recv_q
-            ),
-            # local_addr=self._local_addr,
-            # remote_addr=self._dev_addr,
-            sock=sock,
-        )
+        if hasattr(sock, "recvmsg_into") and isinstance(
+            loop, asyncio.SelectorEventLoop
+        ):
+            # Drain the socket in batches into a reused buffer.
+            sock.setblocking(False)
+            self._transport = RecvIntoDatagramTransport(
+                loop,
+                sock,
+                CerebusDatagramProtocol(
+                    conn_lost_future, self._proto_ver, self._recv_q
+                ),
+            )
+        else:
+            # e.g. Windows' ProactorEventLoop: No recvmsg_into; use the asyncio transport.
+            self._transport, _protocol = await loop.create_datagram_endpoint(
+                lambda: CerebusDatagramProtocol(
+                    conn_lost_future, self._proto_ver, self._recv_q
+                ),
+                # local_addr=self._local_addr,
+                # remote_addr=self._dev_addr,
+                sock=sock,
+            )
+        self._transport_ready.set()
         await conn_lost_future
         # We might reach here when the remote disconnects (i.e., not when the client quits).
         # In such cases, we must also kill sender_coro.
         await self._send_q.async_put("quit")
 
     async def _sender_coro(self):
-        while self._transport is None:
-            await asyncio.sleep(0.1)
+        await self._transport_ready.wait()
 
         running = True
         while running:
@@ -1,10 +1,8 @@
 from abc import abstractmethod
 from ctypes import *
-import struct
 import numpy as np
 import numpy.typing
 from .common import (
-    CBPacketType,
     CBSpecialChan,
 )
 
@@ -12,6 +10,19 @@ from .common import (
 # https://wumb0.in/a-better-way-to-work-with-raw-data-types-in-python.html
 
 
+# numpy dtype for each ctypes array element type; converting a ctypes type to a dtype is slow.
+_np_dtypes = {}
+# Body length in 32-bit words of each packet class's fixed part, for header.dlen.
+_fixed_dlens = {}
+
+
+def _fixed_dlen(cls) -> int:
+    dlen = _fixed_dlens.get(cls)
+    if dlen is None:
+        dlen = _fixed_dlens[cls] = (sizeof(cls) - cls.header.size) // 4
+    return dlen
+
+
 class CBPacketAbstract(Structure):
     _pack_ = 1
 
@@ -24,29 +35,26 @@ class CBPacketAbstract(Structure):
     def __init__(self, buffer=None):
         super().__init__()
         if not buffer:
-            self.header.time = (
+            header = self.header
+            header.time = (
                 0  # Will get updated to current proctime before being sent to device.
             )
-            self.header.chid = self.default_chid
-            self.header.type = self.default_type
-            self.header.dlen = (sizeof(self.__class__) - sizeof(self.header)) // 4
-
-    @property
-    @abstractmethod
-    def default_type(self) -> CBPacketType:
-        pass
+            header.chid = self.default_chid
+            header.type = self.default_type
+            header.dlen = _fixed_dlen(self.__class__)
 
-    @property
-    @abstractmethod
-    def default_chid(self) -> int:
-        pass
+    # Concrete packet classes set these as plain-int class attributes so they are not
+    #  re-evaluated (nor enum-converted) on every packet construction.
+    default_type: int
+    default_chid: int
 
 
 class CBPacketVarLen(CBPacketAbstract):
     def __init__(self, buffer=None):
         super().__init__(buffer=buffer)  # Handles case of buffer is None
-        if buffer and len(buffer) > sizeof(self.__class__):
-            array_bytes = buffer[sizeof(self.__class__) :]
+        n_fixed = sizeof(self.__class__)
+        if buffer and len(buffer) > n_fixed:
+            array_bytes = buffer[n_fixed:]
             n_bytes = len(array_bytes)
             n_items = n_bytes // sizeof(self._array._type_)
             self._array = (self._array._type_ * n_items)()
@@ -59,14 +67,8 @@ class CBPacketVarLen(CBPacketAbstract):
     def __bytes__(self):
         # Need a custom __bytes__ representation to add on _array. Unfortunately, we
         # can't start with `bytes(self)` because it is infinitely recursive.
-        # TODO: Potential for optimization -- Get bytes representation of main body more quickly.
-        out_bytes = b""
-        for f, t in self._fields_:
-            if isinstance(getattr(self, f), (int, float)):
-                out_bytes += struct.pack(t._type_, getattr(self, f))
-            else:
-                out_bytes += bytes(getattr(self, f))
-        return out_bytes + bytes(self._array)
+        # The structure is packed, so its fixed part is a single contiguous copy.
+        return string_at(addressof(self), sizeof(self.__class__)) + bytes(self._array)
 
     @property
     @abstractmethod
@@ -89,7 +91,12 @@ class CBPacketVarLen(CBPacketAbstract):
 class CBPacketVarDataNDArray(CBPacketVarLen):
     @property
     def data(self) -> np.ndarray:
-        return np.ctypeslib.as_array(self._array)
+        # A zero-copy view, like np.ctypeslib.as_array but without its per-call overhead.
+        item_type = self._array._type_
+        dtype = _np_dtypes.get(item_type)
+        if dtype is None:
+            dtype = _np_dtypes[item_type] = np.dtype(item_type)
+        return np.frombuffer(self._array, dtype=dtype)
 
     @data.setter
     def data(self, indata: numpy.typing.ArrayLike):
@@ -113,14 +120,12 @@ class CBPacketConfigFixed(Structure):
     def __init__(self, buffer=None):
         super().__init__()
         if not buffer:
-            self.header.time = (
+            header = self.header
+            header.time = (
                 0  # Will get updated to current proctime before being sent to device.
             )
-            self.header.chid = CBSpecialChan.CONFIGURATION
-            self.header.type = self.default_type
-            self.header.dlen = (sizeof(self.__class__) - sizeof(self.header)) // 4
+            header.chid = CBSpecialChan.CONFIGURATION
+            header.type = self.default_type
+            header.dlen = _fixed_dlen(self.__class__)
 
-    @property
-    @abstractmethod
-    def default_type(self):
-        pass
+    default_type: int  # Set as a plain-int class attribute by concrete packet classes.
@@ -1,17 +1,23 @@
 from ctypes import *
-from typing import Type
+from typing import Optional, Type
 from .. import config
 from .common import CBPacketType, CBChannelType, CBSpecialChan
+from .pool import PacketPool
 
 # Note, we cannot import anything in the top-level ..packet module
 # until after config.protocol is set during CBPacketFactory init.
 # Submodules are OK.
 
+# Config packet types are all single-byte values (even when the header type field is 16-bit),
+#  so the class lookup can be a flat list indexed by type.
+N_PKT_TYPES = 256
+
 
 class CBPacketFactory:
-    def __init__(self, protocol="4.1"):
+    def __init__(self, protocol="4.1", pool: Optional[PacketPool] = None):
         config.protocol = protocol
-        self._pktcls_by_type = {}
+        self._pool = pool
+        self._pktcls_by_type: list[Optional[Type[Structure]]] = [None] * N_PKT_TYPES
         self._pktcls_by_chantype = {}
         self._fallback_class = None
 
@@ -32,6 +38,8 @@ class CBPacketFactory:
         if not isinstance(pkt_types, list):
             pkt_types = [pkt_types]
         for pkt_type in pkt_types:
+            if not 0 <= pkt_type < N_PKT_TYPES:
+                raise ValueError(f"Packet type {hex(pkt_type)} out of range.")
             self._pktcls_by_type[pkt_type] = pkt_class
 
     def register_pktcls_by_channel_type(
@@ -57,10 +65,9 @@ class CBPacketFactory:
     ) -> Type[Structure]:
         # chid is 0x8000 for config packets, or another non-zero value for event (spike, comment, etc) packets.
         # It is 0 for sample group packets.
-        if not chid:
-            header = self.header_cls.from_buffer_copy(data[: self.header_size])
-            chid = header.chid
-            pkt_type = header.type
+        if chid is None or pkt_type is None:
+            # Callers that already parsed the header (e.g., the packet handler) pass chid and pkt_type.
+            _, chid, pkt_type = self.header_cls.HEADER_STRUCT.unpack_from(data)[:3]
         """
         The logic to figure out the packet type is a bit complicated.
         This first link provides a good example of how to determine which kind of config packet.
@@ -72,12 +79,12 @@ class CBPacketFactory:
         pkt_cls = None
         if chid & CBSpecialChan.CONFIGURATION:
             # Configuration packets. We can usually figure out what kind of config packet by its type.
-            if pkt_type in self._pktcls_by_type:
+            if pkt_type < N_PKT_TYPES:
                 pkt_cls = self._pktcls_by_type[pkt_type]
-            elif (pkt_type & 0xF0) in self._pktcls_by_type:
+            if pkt_cls is None:
                 # Some packet types serve multiple header pkt_type, but they share the same first byte.
                 pkt_cls = self._pktcls_by_type[pkt_type & 0xF0]
-            elif self._fallback_class is not None:
+            if pkt_cls is None:
                 # Unknown configuration packet. This should probably be a generic packet.
                 pkt_cls = self._fallback_class
         elif chantype and chantype in self._pktcls_by_chantype:
@@ -97,7 +104,14 @@ class CBPacketFactory:
                 chid,
             )
         try:
-            pkt = pkt_cls(data)
+            if (
+                self._pool is not None
+                and data is not None
+                and len(data) <= self._pool.slot_size
+            ):
+                pkt = self._pool.acquire(pkt_cls, data)
+            else:
+                pkt = pkt_cls(data)
             if data is None:
                 pkt.header.chid = chid
                 pkt.header.type = pkt_type
@@ -1,4 +1,5 @@
 from ctypes import *
+import struct
 
 
 class CBPacketHeader(Structure):
@@ -13,7 +14,10 @@ class CBPacketHeader(Structure):
         ),  # Number of 32-bit elements in packet body. * 4 to get number of bytes.
     ]
 
+    # Precompiled, so parsers can unpack headers straight from a buffer without a ctypes copy.
+    HEADER_STRUCT = struct.Struct("<LHBB")
+
     @classmethod
     @property
     def HEADER_FORMAT(cls):
-        return "<LHBB"
+        return cls.HEADER_STRUCT.format
@@ -1,4 +1,5 @@
 from ctypes import *
+import struct
 
 
 class CBPacketHeader(Structure):
@@ -15,7 +16,10 @@ class CBPacketHeader(Structure):
         ("reserved", 2 * c_uint8),
     ]
 
+    # Precompiled, so parsers can unpack headers straight from a buffer without a ctypes copy.
+    HEADER_STRUCT = struct.Struct("<QHBHBH")
+
     @classmethod
     @property
     def HEADER_FORMAT(cls):
-        return "<QHBHBH"
+        return cls.HEADER_STRUCT.format
@@ -1,4 +1,5 @@
 from ctypes import *
+import struct
 from ..common import print_pretty
 
 
@@ -17,7 +18,10 @@ class CBPacketHeader(Structure):
         ("reserved", c_uint8),  # Changed in this version; used to be 2 * c_uint8
     ]
 
+    # Precompiled, so parsers can unpack headers straight from a buffer without a ctypes copy.
+    HEADER_STRUCT = struct.Struct("<QHHHBB")
+
     @classmethod
     @property
     def HEADER_FORMAT(cls):
-        return "<QHHHBB"
+        return cls.HEADER_STRUCT.format
@@ -79,13 +79,8 @@ class CBPacketSpike(CBPacketVarDataNDArray):
 
     # TODO: Static method to update static spklen for decode/encode. Only need to be set when device spklen changes.
 
-    @property
-    def default_type(self):
-        return 0x00
-
-    @property
-    def default_chid(self):
-        return 1
+    default_type = 0x00
+    default_chid = 1
 
     @property
     def max_elements(self):
@@ -122,13 +117,8 @@ class CBPacketGroup(CBPacketVarDataNDArray):
     _fields_ = [("header", CBPacketHeader)]
     _array = (c_int16 * 0)()  # dtype is v3.x: int16; v4.x: A2_DATA.
 
-    @property
-    def default_type(self):
-        return 0x00
-
-    @property
-    def default_chid(self):
-        return 0x0000
+    default_type = 0x00
+    default_chid = 0x0000
 
     @property
     def max_elements(self):
@@ -151,13 +141,8 @@ class CBPacketGeneric(CBPacketVarLen):
     def max_elements(self) -> int:
         return (1024 - sizeof(CBPacketHeader)) // 4
 
-    @property
-    def default_chid(self) -> int:
-        return 0
-
-    @property
-    def default_type(self):
-        return CBPacketType.SYSHEARTBEAT  # 0x00
+    default_chid = 0
+    default_type = CBPacketType.SYSHEARTBEAT.value  # 0x00
 
     @property
     def data(self):
@@ -194,9 +179,7 @@ class CBPacketSetDOut(CBPacketConfigFixed):
         ),  # Which value to set? zero = 0; non-zero = 1 (output is 1 bit)
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.SET_DOUTSET
+    default_type = CBPacketType.SET_DOUTSET.value
 
 
 class CBPacketGroupInfo(CBPacketVarDataNDArray):
@@ -210,13 +193,8 @@ class CBPacketGroupInfo(CBPacketVarDataNDArray):
     ]
     _array = (c_uint16 * 0)()  # Channel membership in group
 
-    @property
-    def default_chid(self) -> int:
-        return CBSpecialChan.CONFIGURATION
-
-    @property
-    def default_type(self):
-        return CBPacketType.GROUPSET
+    default_chid = CBSpecialChan.CONFIGURATION.value
+    default_type = CBPacketType.GROUPSET.value
 
     @property
     def max_elements(self) -> int:
@@ -254,9 +232,7 @@ class CBPacketFiltInfo(CBPacketConfigFixed):
         ("sos2b2", c_double),
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.FILTSET
+    default_type = CBPacketType.FILTSET.value
 
     @property
     def label(self) -> str:
@@ -308,9 +284,7 @@ class CBPacketProcInfo(CBPacketConfigFixed):
         ("version", c_uint32),  # current version of libraries
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.PROCREP
+    default_type = CBPacketType.PROCREP.value
 
     @property
     def ident(self) -> str:
@@ -349,9 +323,7 @@ class CBPacketBankInfo(CBPacketConfigFixed):
         ("chancount", c_uint32),  # number of channel identifiers claimed by this bank
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.BANKREP
+    default_type = CBPacketType.BANKREP.value
 
     @property
     def ident(self) -> str:
@@ -395,9 +367,7 @@ class CBPacketNTrodeInfo(CBPacketConfigFixed):
         ("nchan", c_uint16 * 4),  # group of channels in this NTrode
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.SETNTRODEINFO
+    default_type = CBPacketType.SETNTRODEINFO.value
 
 
 class CBPacketAdaptFiltInfo(CBPacketConfigFixed):
@@ -416,9 +386,7 @@ class CBPacketAdaptFiltInfo(CBPacketConfigFixed):
         ("nRefChan2", c_uint32),  # The second reference channel (1 based).
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.ADAPTFILTSET
+    default_type = CBPacketType.ADAPTFILTSET.value
 
 
 class CBPacketRefElecFiltInfo(CBPacketConfigFixed):
@@ -432,9 +400,7 @@ class CBPacketRefElecFiltInfo(CBPacketConfigFixed):
         ("nRefChan", c_uint32),  # The reference channel (1 based).
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.REFELECFILTSET
+    default_type = CBPacketType.REFELECFILTSET.value
 
 
 @print_pretty
@@ -446,9 +412,7 @@ class CBPacketLNC(CBPacketConfigFixed):
         ("lncGlobalMode", c_uint32),  # reserved
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.LNCSET
+    default_type = CBPacketType.LNCSET.value
 
 
 class CBPacketFileCFG(CBPacketVarLen):
@@ -472,13 +436,8 @@ class CBPacketFileCFG(CBPacketVarLen):
     def max_elements(self) -> int:
         return 256 + 256 + 256
 
-    @property
-    def default_chid(self) -> int:
-        return CBSpecialChan.CONFIGURATION
-
-    @property
-    def default_type(self):
-        return CBPacketType.SETFILECFG
+    default_chid = CBSpecialChan.CONFIGURATION.value
+    default_type = CBPacketType.SETFILECFG.value
 
     @property
     def username(self) -> str:
@@ -517,13 +476,8 @@ class CBPacketVideoTrack(CBPacketVarDataNDArray):
     def max_elements(self):
         return 128
 
-    @property
-    def default_chid(self) -> int:
-        return CBSpecialChan.CONFIGURATION
-
-    @property
-    def default_type(self):
-        return CBPacketType.VIDEOTRACKSET
+    default_chid = CBSpecialChan.CONFIGURATION.value
+    default_type = CBPacketType.VIDEOTRACKSET.value
 
     @property
     def sizes(self) -> list[int]:
@@ -561,13 +515,8 @@ class CBPacketLog(CBPacketVarLen):
     ]
     _array = (c_char * 0)()  # For `desc` field: description of the change
 
-    @property
-    def default_type(self):
-        return CBPacketType.LOGSET
-
-    @property
-    def default_chid(self) -> int:
-        return CBSpecialChan.CONFIGURATION
+    default_type = CBPacketType.LOGSET.value
+    default_chid = CBSpecialChan.CONFIGURATION.value
 
     @property
     def max_elements(self):
@@ -593,9 +542,7 @@ class CBPacketVideoSynch(CBPacketConfigFixed):
         ("id", c_uint16),  # video source id
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.VIDEOSYNCHSET
+    default_type = CBPacketType.VIDEOSYNCHSET.value
 
 
 class CBPacketGyro(CBPacketConfigFixed):
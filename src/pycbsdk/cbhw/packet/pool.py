@@ -0,0 +1,53 @@
+from ctypes import *
+import mmap
+from typing import Type
+
+from .common import PKT_MAX_SIZE
+
+
+class PacketPool:
+    """
+    Ring of preallocated packet slots backed by a single anonymous mmap.
+    Packets acquired from the pool are cast directly onto a slot, so steady-state packet
+    construction does not allocate new ctypes buffers.
+    Note: A pooled packet is only valid until its slot is reused `n_slots` acquisitions later.
+     Anything that must outlive that (e.g., config state) has to be copied.
+    """
+
+    def __init__(self, n_slots: int = 1024, slot_size: int = PKT_MAX_SIZE):
+        self._n_slots = n_slots
+        self._slot_size = slot_size
+        self._mm = mmap.mmap(-1, n_slots * slot_size)
+        self._base_addr = addressof(c_char.from_buffer(self._mm))
+        self._idx = 0
+        # pkt_cls -> (fixed size, variable-length item size or 0); computed on first use.
+        self._layouts: dict[Type[Structure], tuple[int, int]] = {}
+
+    @property
+    def slot_size(self) -> int:
+        return self._slot_size
+
+    def _layout(self, pkt_cls: Type[Structure]) -> tuple[int, int]:
+        layout = (
+            sizeof(pkt_cls),
+            sizeof(pkt_cls._array._type_) if hasattr(pkt_cls, "_array") else 0,
+        )
+        self._layouts[pkt_cls] = layout
+        return layout
+
+    def acquire(self, pkt_cls: Type[Structure], data: bytes) -> Structure:
+        n_bytes = len(data)
+        layout = self._layouts.get(pkt_cls)
+        n_fixed, item_size = layout if layout is not None else self._layout(pkt_cls)
+        addr = self._base_addr + self._idx * self._slot_size
+        self._idx = (self._idx + 1) % self._n_slots
+        memmove(addr, data, n_bytes)
+        if n_bytes < n_fixed:
+            # Firmware truncates structs to a multiple of 4 bytes; zero the missing tail.
+            memset(addr + n_bytes, 0, n_fixed - n_bytes)
+        pkt = pkt_cls.from_address(addr)
+        if n_bytes > n_fixed and item_size:
+            # Variable-length payload; view it in-place rather than copying it out.
+            n_items = (n_bytes - n_fixed) // item_size
+            pkt._array = (pkt_cls._array._type_ * n_items).from_address(addr + n_fixed)
+        return pkt
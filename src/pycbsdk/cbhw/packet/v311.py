@@ -1,5 +1,7 @@
 from ctypes import *
-import struct
+
+import numpy as np
+
 from .common import (
     CBPacketType,
     CBSpecialChan,
@@ -24,9 +26,7 @@ class CBPacketSysInfo(CBPacketConfigFixed):
         ("runflags", c_uint32),
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.SYSSET
+    default_type = CBPacketType.SYSSET.value
 
 
 class CBPacketSysProtocolMonitor(CBPacketConfigFixed):
@@ -40,9 +40,7 @@ class CBPacketSysProtocolMonitor(CBPacketConfigFixed):
         # be equal to at least 1
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.SYSPROTOCOLMONITOR
+    default_type = CBPacketType.SYSPROTOCOLMONITOR.value
 
 
 class CBPacketChanInfo(CBPacketConfigFixed):
@@ -110,25 +108,20 @@ class CBPacketChanInfo(CBPacketConfigFixed):
         ("spkhoops", CBHoop * 4 * 5),  # spike hoop sorting set
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.CHANSET
+    default_type = CBPacketType.CHANSET.value
 
 
 class CBPacketDIn(CBPacketVarDataNDArray):
     _fields_ = [("header", CBPacketHeader)]
     _array = (c_uint32 * 0)()
 
-    @property
-    def default_type(self):
-        return 0x00
-
-    @property
-    def default_chid(self) -> int:
-        return 279  # Best to figure this out in the calling function using chancaps.
+    default_type = 0x00
+    # Best to figure this out in the calling function using chancaps.
+    default_chid = 279
 
     @property
     def data(self):
+        # Note: This builds a list of Python ints. Prefer `as_ndarray()` for bulk processing.
         return self._array[: self.header.dlen]
 
     @data.setter
@@ -139,6 +132,14 @@ class CBPacketDIn(CBPacketVarDataNDArray):
         self._array = (self._array._type_ * len(value))(*value)
         self._update_dlen()
 
+    def as_ndarray(self) -> np.ndarray:
+        """
+        Get the payload as a uint32 numpy array that shares memory with the packet (no copy).
+        """
+        return np.frombuffer(
+            self._array, dtype="<u4", count=min(self.header.dlen, len(self._array))
+        )
+
 
 class CBPacketNPlay(CBPacketVarLen):
     _fields_ = [
@@ -153,13 +154,8 @@ class CBPacketNPlay(CBPacketVarLen):
     ]
     _array = (c_char * 0)()
 
-    @property
-    def default_type(self):
-        return CBPacketType.NPLAYSET
-
-    @property
-    def default_chid(self) -> int:
-        return CBSpecialChan.CONFIGURATION
+    default_type = CBPacketType.NPLAYSET.value
+    default_chid = CBSpecialChan.CONFIGURATION.value
 
     @property
     def max_elements(self):
@@ -206,13 +202,8 @@ class CBPacketComment(CBPacketVarLen):
         c_char * 0
     )()  # Supposed to be variable length, but seems like it is always padded out to 128.
 
-    @property
-    def default_type(self):
-        return CBPacketType.COMMENTSET
-
-    @property
-    def default_chid(self):
-        return CBSpecialChan.CONFIGURATION
+    default_type = CBPacketType.COMMENTSET.value
+    default_chid = CBSpecialChan.CONFIGURATION.value
 
     @property
     def max_elements(self) -> int:
@@ -241,22 +232,22 @@ class CBPacketComment(CBPacketVarLen):
 
     @property
     def rgba(self):
-        return (
-            (0, 0, 0, 1)
-            if self.flags
-            else struct.unpack("4B", struct.pack("I", self.data))
-        )
+        if self.info.flags:
+            return 0, 0, 0, 1
+        d = self.data
+        return d & 0xFF, (d >> 8) & 0xFF, (d >> 16) & 0xFF, (d >> 24) & 0xFF
 
     @rgba.setter
     def rgba(self, value: tuple):
-        self.data = struct.unpack("I", struct.pack("4B", *value))
-        self.flags = 0x00
+        r, g, b, a = value
+        self.data = (r & 0xFF) | (g & 0xFF) << 8 | (b & 0xFF) << 16 | (a & 0xFF) << 24
+        self.info.flags = 0x00
 
     @property
     def timeStarted(self):
-        return self.data if self.flags else -1
+        return self.data if self.info.flags else -1
 
     @timeStarted.setter
     def timeStarted(self, value: int):
         self.data = value
-        self.flags = 0x01
+        self.info.flags = 0x01
@@ -18,13 +18,9 @@ class CBPacketDIn(CBPacketConfigFixed):
         ),  # type of event, eg DINP_EVENT_ANYBIT, DINP_EVENT_STROBE
     ]
 
-    @property
-    def default_type(self):
-        return 0x00
-
-    @property
-    def default_chid(self) -> int:
-        return 279  # Just a guess. Best to figure this out in the calling function using chancaps
+    default_type = 0x00
+    # Just a guess. Best to figure this out in the calling function using chancaps
+    default_chid = 279
 
 
 class CBPacketNPlay(CBPacketVarLen):
@@ -40,13 +36,8 @@ class CBPacketNPlay(CBPacketVarLen):
     ]
     _array = (c_char * 0)()
 
-    @property
-    def default_type(self):
-        return CBPacketType.NPLAYSET
-
-    @property
-    def default_chid(self) -> int:
-        return CBSpecialChan.CONFIGURATION
+    default_type = CBPacketType.NPLAYSET.value
+    default_chid = CBSpecialChan.CONFIGURATION.value
 
     @property
     def max_elements(self):
@@ -93,13 +84,8 @@ class CBPacketComment(CBPacketVarLen):
         c_char * 0
     )()  # Supposed to be variable length, but seems like it is always padded out to 128.
 
-    @property
-    def default_type(self):
-        return CBPacketType.COMMENTSET
-
-    @property
-    def default_chid(self):
-        return CBSpecialChan.CONFIGURATION
+    default_type = CBPacketType.COMMENTSET.value
+    default_chid = CBSpecialChan.CONFIGURATION.value
 
     @property
     def max_elements(self) -> int:
@@ -27,9 +27,7 @@ class CBPacketSysProtocolMonitor(CBPacketConfigFixed):
         ("counter", c_uint32),  # Counter of this type of packet
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.SYSPROTOCOLMONITOR
+    default_type = CBPacketType.SYSPROTOCOLMONITOR.value
 
 
 @print_pretty
@@ -114,6 +112,4 @@ class CBPacketChanInfo(CBPacketConfigFixed):
         ("spkhoops", CBHoop * MAX_HOOPS * MAX_UNITS),  # spike hoop sorting set
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.CHANSET
+    default_type = CBPacketType.CHANSET.value
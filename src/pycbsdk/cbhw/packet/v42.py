@@ -21,6 +21,4 @@ class CBPacketSysInfo(CBPacketConfigFixed):
         ("reserved", c_uint8 * 2),
     ]
 
-    @property
-    def default_type(self):
-        return CBPacketType.SYSSET
+    default_type = CBPacketType.SYSSET.value
@@ -1,10 +1,81 @@
-from typing import Optional
+import hashlib
+import json
 import logging
+import os
+from pathlib import Path
 import sys
+import threading
+from typing import Optional
 
 import ifaddr
 
-from ..misc.net import ping
+from ..misc.net import find_responsive_host, ping
+
+
+DEFAULT_RECV_BUFSIZE = 12 * 1024 * 1024  # May be capped by the OS; see README.
+KNOWN_INST_ADDRS = ["192.168.137." + _term for _term in ["200", "201", "128"]]
+CACHED_INST_PING_TIMEOUT = 0.05
+# Addresses already found in this process, by adapters key. The lock makes concurrent lookups share one probe.
+_found_inst_addrs: dict[str, str] = {}
+_find_inst_addr_lock = threading.Lock()
+
+
+def _net_cache_path() -> Path:
+    base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "pycbsdk" / "net_cache.json"
+
+
+def _adapters_key(adapters: list) -> str:
+    # ifaddr does not expose MACs; the set of IPv4 adapter addresses identifies the network setup well enough.
+    ips = sorted(
+        f"{adapter.nice_name}/{ip.ip}"
+        for adapter in adapters
+        for ip in adapter.ips
+        if ip.is_IPv4
+    )
+    return hashlib.blake2b(str(ips).encode(), digest_size=8).hexdigest()
+
+
+def _load_net_cache() -> dict:
+    try:
+        with open(_net_cache_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_net_cache(key: str, inst_addr: str) -> None:
+    cache = _load_net_cache()
+    cache[key] = inst_addr
+    path = _net_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logging.debug(f"Could not write network cache {path}: {e}")
+
+
+def _find_inst_addr(adapters: list) -> str:
+    """
+    Find a device at one of the known addresses. The last address found with this set of
+    network adapters is cached on disk and tried first with a single short ping.
+    Within a process, an address found for this set of adapters is reused without probing again.
+    """
+    key = _adapters_key(adapters)
+    with _find_inst_addr_lock:
+        if key in _found_inst_addrs:
+            return _found_inst_addrs[key]
+        cached = _load_net_cache().get(key)
+        if cached and ping(cached, timeout=CACHED_INST_PING_TIMEOUT):
+            inst_addr = cached
+        else:
+            inst_addr = find_responsive_host(KNOWN_INST_ADDRS) or ""
+            if inst_addr != "":
+                _store_net_cache(key, inst_addr)
+        if inst_addr != "":
+            _found_inst_addrs[key] = inst_addr
+        return inst_addr
 
 
 class Params:
@@ -16,6 +87,19 @@ class Params:
      but I'm not a complete masochist so I'll leverage Python's property functionality for this prototype.)
     """
 
+    __slots__ = (
+        "_busy_poll_us",
+        "_client_addr",
+        "_client_port",
+        "_inst_addr",
+        "_inst_port",
+        "_packet_pool_size",
+        "_pin_cpu",
+        "_protocol",
+        "_recv_bufsize",
+        "_recv_priority",
+    )
+
     def __init__(
         self,
         inst_addr: str = "",
@@ -24,12 +108,18 @@ class Params:
         client_port: int = 51002,
         recv_bufsize: Optional[int] = None,
         protocol: str = "4.1",
+        packet_pool_size: int = 0,
+        busy_poll_us: int = 0,
+        pin_cpu: Optional[int] = None,
+        recv_priority: Optional[int] = None,
     ):
+        adapters = None
         if client_addr == "":
             # We need to specify the machine's network adapter IP address, depending on the platform.
             if sys.platform.lower() == "win32":
                 # In Windows, we cannot use a netmask. We must specify the IP exactly. So we search for it.
-                for adapter in ifaddr.get_adapters():
+                adapters = ifaddr.get_adapters()
+                for adapter in adapters:
                     for ip in adapter.ips:
                         if ip.is_IPv4 and ip.ip.startswith("192.168.137"):
                             client_addr = ip.ip
@@ -65,11 +155,9 @@ class Params:
                 )
                 # TODO: Wouldn't it be great if we could broadcast a packet, identify any response
                 #  Cerebus packets on port 51002, then use the origin IP from that?
-                for _term in ["200", "201", "128"]:
-                    _test_addr = "192.168.137." + _term
-                    if ping(_test_addr):
-                        inst_addr = _test_addr
-                        break
+                if adapters is None:
+                    adapters = ifaddr.get_adapters()
+                inst_addr = _find_inst_addr(adapters)
                 if inst_addr == "":
                     raise ValueError(
                         "inst_addr: Unable to find a device at any of the known addresses. "
@@ -82,11 +170,13 @@ class Params:
         self._client_addr = client_addr
         self._client_port = client_port
         self._recv_bufsize = (
-            recv_bufsize
-            if recv_bufsize is not None
-            else (8 if sys.platform == "win32" else 6) * 1024 * 1024
+            recv_bufsize if recv_bufsize is not None else DEFAULT_RECV_BUFSIZE
         )
         self._protocol = protocol
+        self._packet_pool_size = packet_pool_size
+        self._busy_poll_us = busy_poll_us
+        self._pin_cpu = pin_cpu
+        self._recv_priority = recv_priority
 
     def __str__(self):
         return (
@@ -142,3 +232,35 @@ class Params:
     @protocol.setter
     def protocol(self, value: str):
         self._protocol = value
+
+    @property
+    def packet_pool_size(self) -> int:
+        return self._packet_pool_size
+
+    @packet_pool_size.setter
+    def packet_pool_size(self, value: int):
+        self._packet_pool_size = value
+
+    @property
+    def busy_poll_us(self) -> int:
+        return self._busy_poll_us
+
+    @busy_poll_us.setter
+    def busy_poll_us(self, value: int):
+        self._busy_poll_us = value
+
+    @property
+    def pin_cpu(self) -> Optional[int]:
+        return self._pin_cpu
+
+    @pin_cpu.setter
+    def pin_cpu(self, value: Optional[int]):
+        self._pin_cpu = value
+
+    @property
+    def recv_priority(self) -> Optional[int]:
+        return self._recv_priority
+
+    @recv_priority.setter
+    def recv_priority(self, value: Optional[int]):
+        self._recv_priority = value
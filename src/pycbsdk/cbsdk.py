@@ -2,6 +2,8 @@ from ctypes import Structure
 from typing import Optional
 from collections.abc import Callable
 
+import numpy as np
+
 from .cbhw.device.nsp import *
 from .cbhw.params import Params
 from .cbhw.packet.common import CBPacketType, CBChannelType, DEFAULT_TIMEOUT
@@ -28,11 +30,15 @@ __all__ = [
     "set_channel_disable",
     "set_all_channels_disable",
     "set_channel_config",
+    "set_channels_config",
     "set_all_channels_config",
     "set_channel_spk_config",
+    "set_channels_spk_config",
     "set_all_channels_spk_config",
     "set_channel_continuous_raw_data",
+    "wait_config_applied",
     "get_config",
+    "get_channels_by_type",
     "reset_nsp",
     "set_transport",
     "set_runlevel",
@@ -41,8 +47,16 @@ __all__ = [
     "unregister_event_callback",
     "register_spk_callback",
     "unregister_spk_callback",
+    "register_event_batch_callback",
+    "unregister_event_batch_callback",
+    "register_spk_batch_callback",
+    "unregister_spk_batch_callback",
     "register_group_callback",
     "unregister_group_callback",
+    "register_group_raw_callback",
+    "unregister_group_raw_callback",
+    "register_group_batch_callback",
+    "unregister_group_batch_callback",
     "register_config_callback",
     "unregister_config_callback",
     "CBRunLevel",
@@ -59,7 +73,23 @@ def create_params(
     client_port: int = 51002,
     recv_bufsize: Optional[int] = None,
     protocol: str = "4.1",
+    packet_pool_size: int = 0,
+    busy_poll_us: int = 0,
+    pin_cpu: Optional[int] = None,
+    recv_priority: Optional[int] = None,
 ) -> Params:
+    """
+    :param packet_pool_size: If > 0, received packets are built in a ring of this many preallocated
+        slots instead of being allocated one-by-one. Packets passed to callbacks are then only valid
+        until their slot is reused, so callbacks must copy anything they want to keep.
+    :param busy_poll_us: Linux only. If > 0, set SO_BUSY_POLL on the receive socket so the kernel
+        busy-polls the NIC for this many microseconds instead of sleeping. May require CAP_NET_ADMIN.
+    :param pin_cpu: Linux only. Pin the receive thread to this CPU and ask the kernel (SO_INCOMING_CPU)
+        to steer the socket's packets to it. Ideally the CPU that services the NIC's IRQ.
+    :param recv_priority: Raise the receive thread's scheduling priority. On Linux, this is the
+        SCHED_FIFO priority (1-99) and requires CAP_SYS_NICE. On Windows, any value sets
+        THREAD_PRIORITY_TIME_CRITICAL.
+    """
     params_obj = Params(
         inst_addr=inst_addr,
         inst_port=inst_port,
@@ -67,6 +97,10 @@ def create_params(
         client_port=client_port,
         recv_bufsize=recv_bufsize,
         protocol=protocol,
+        packet_pool_size=packet_pool_size,
+        busy_poll_us=busy_poll_us,
+        pin_cpu=pin_cpu,
+        recv_priority=recv_priority,
     )
 
     return params_obj
@@ -106,6 +140,20 @@ def set_channel_config(
     device.configure_channel(chid, attr, value, timeout=timeout)
 
 
+def set_channels_config(
+    device: NSPDevice,
+    chids: list[int],
+    attr: str,
+    value,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> bool:
+    """
+    Set the same attribute on several channels, waiting once for all replies.
+    :return: False if timeout > 0 and not all channels replied in time.
+    """
+    return device.configure_channels(chids, attr, value, timeout)
+
+
 def set_all_channels_config(
     device: NSPDevice,
     chtype: CBChannelType,
@@ -122,6 +170,20 @@ def set_channel_spk_config(
     device.configure_channel_spike(chid, attr, value, timeout)
 
 
+def set_channels_spk_config(
+    device: NSPDevice,
+    chids: list[int],
+    attr: str,
+    value,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> bool:
+    """
+    Set the same spike attribute on several channels, waiting once for all replies.
+    :return: False if timeout > 0 and not all channels replied in time.
+    """
+    return device.configure_channels_spike(chids, attr, value, timeout)
+
+
 def set_all_channels_spk_config(
     device: NSPDevice,
     chtype: CBChannelType,
@@ -144,10 +206,27 @@ def set_channel_continuous_raw_data(
     set_channel_spk_config(device, chid, attr="enable", value=False, timeout=timeout)
 
 
+def wait_config_applied(device: NSPDevice, timeout: float = DEFAULT_TIMEOUT) -> bool:
+    """
+    Wait for the device to acknowledge every channel configuration packet sent so far
+    that it has not acknowledged yet.
+    :return: False if any of those acknowledgements did not arrive within timeout.
+        Those acknowledgements are then no longer waited for, by this or later calls.
+    """
+    return device.wait_config_applied(timeout)
+
+
 def get_config(device: NSPDevice, force_refresh: bool = True) -> dict:
     return device.get_config(timeout=5.0, force_refresh=force_refresh)
 
 
+def get_channels_by_type(device: NSPDevice, chtype: CBChannelType) -> np.ndarray:
+    """
+    :return: sorted array of the 1-based chids of all channels of type chtype. Do not modify it.
+    """
+    return device.get_channels_by_type(chtype)
+
+
 # def get_type(device: NSPDevice):  # -> tuple[CBConnectionType, CBDeviceType]:
 #     return device.get_type()
 
@@ -196,6 +275,36 @@ def unregister_spk_callback(
     return unregister_event_callback(device, CBChannelType.FrontEnd, func)
 
 
+def register_event_batch_callback(
+    device: NSPDevice,
+    channel_type: CBChannelType,
+    func: Callable[[np.ndarray, np.ndarray, np.ndarray], None],
+):
+    # func receives (times, chids, units) arrays for up to 64 events at a time.
+    #  The arrays are reused after func returns; copy them to keep them.
+    device.register_event_batch_callback(channel_type, func)
+
+
+def unregister_event_batch_callback(
+    device: NSPDevice,
+    channel_type: CBChannelType,
+    func: Callable[[np.ndarray, np.ndarray, np.ndarray], None],
+) -> int:
+    return device.unregister_event_batch_callback(channel_type, func)
+
+
+def register_spk_batch_callback(
+    device: NSPDevice, func: Callable[[np.ndarray, np.ndarray, np.ndarray], None]
+):
+    register_event_batch_callback(device, CBChannelType.FrontEnd, func)
+
+
+def unregister_spk_batch_callback(
+    device: NSPDevice, func: Callable[[np.ndarray, np.ndarray, np.ndarray], None]
+) -> int:
+    return unregister_event_batch_callback(device, CBChannelType.FrontEnd, func)
+
+
 def register_group_callback(
     device: NSPDevice, group: int, func: Callable[[Structure], None]
 ):
@@ -210,6 +319,38 @@ def unregister_group_callback(
     return device.unregister_group_callback(group, func)
 
 
+def register_group_raw_callback(
+    device: NSPDevice, group: int, func: Callable[[int, bytes], None]
+):
+    # group: 1-6 for sampling group.
+    # func receives (pkt_time, pkt_bytes) without a packet object being constructed.
+    #  pkt_bytes includes the header; samples start at device.packet_factory.header_size.
+    device.register_group_raw_callback(group, func)
+
+
+def unregister_group_raw_callback(
+    device: NSPDevice, group: int, func: Callable[[int, bytes], None]
+) -> int:
+    # group: 1-6 for sampling group.
+    return device.unregister_group_raw_callback(group, func)
+
+
+def register_group_batch_callback(
+    device: NSPDevice, group: int, func: Callable[[np.ndarray, np.ndarray], None]
+):
+    # group: 1-6 for sampling group.
+    # func receives (times, samples) arrays for up to 32 packets at a time; samples is (n, n_channels) int16.
+    #  The arrays are reused after func returns; copy them to keep them.
+    device.register_group_batch_callback(group, func)
+
+
+def unregister_group_batch_callback(
+    device: NSPDevice, group: int, func: Callable[[np.ndarray, np.ndarray], None]
+) -> int:
+    # group: 1-6 for sampling group.
+    return device.unregister_group_batch_callback(group, func)
+
+
 def register_config_callback(
     device: NSPDevice, packet_type: CBPacketType, func: Callable[[Structure], None]
 ):
@@ -1,3 +1,4 @@
+from ctypes import sizeof
 import sys
 import logging
 
@@ -11,28 +12,84 @@ logging.basicConfig(level=logging.NOTSET)
 logger = logging.getLogger(__name__)
 
 
+N_KEEP = 2  # Number of int16 samples kept from each frame.
+ROW_BYTES = N_KEEP * 2
+RING_CAPACITY = 1 << 20  # Most recent frames kept; must be a power of 2.
+
+
 class DummyApp:
-    def __init__(self, duration=21.0, t_step=1 / 30_000):
-        n_samples = int(np.ceil(duration * 30_000))
+    def __init__(self, t_step=1 / 30_000, header_size=16, capacity=RING_CAPACITY):
+        assert capacity & (capacity - 1) == 0, "capacity must be a power of 2"
         self._t_step = t_step
-        self._buffer = np.zeros((n_samples, 2), dtype=np.int16)
-        self._ts = np.zeros((n_samples,), dtype=np.int64)
+        self._header_size = header_size
+        self._mask = capacity - 1
+        # Ring buffer of the most recent frames, so memory does not grow with the run duration.
+        # Frames are copied in as raw bytes; self._buffer is an int16 view onto the same memory.
+        self._raw = bytearray(capacity * ROW_BYTES)
+        self._buffer = np.frombuffer(self._raw, dtype=np.int16).reshape(
+            capacity, N_KEEP
+        )
+        # Total frames received; the next frame goes into row (self._write_index & self._mask).
         self._write_index = 0
+        # Running timestamp statistics; no per-sample timestamp history is needed.
+        self._first_time = 0
         self._last_time = 0
 
     def handle_frame(self, pkt):
-        if self._write_index < self._buffer.shape[0]:
-            self._buffer[self._write_index, :] = memoryview(pkt.data[:4])
-            self._ts[self._write_index] = pkt.header.time
-            self._write_index += 1
+        # Write into the preallocated ring at the cursor; never reallocate per packet.
+        wi = self._write_index
+        wp = (wi & self._mask) * ROW_BYTES
+        # A plain byte copy; skips building an ndarray from the packet and NumPy's assignment.
+        frame = pkt._array
+        n_frame_bytes = sizeof(frame)
+        if n_frame_bytes == ROW_BYTES:
+            # Common case (1 enabled channel, padded to 4 bytes): copy the ctypes buffer as-is.
+            self._raw[wp : wp + ROW_BYTES] = frame
+        elif n_frame_bytes > ROW_BYTES:
+            self._raw[wp : wp + ROW_BYTES] = memoryview(frame).cast("B")[:ROW_BYTES]
+        pkt_time = pkt.header.time
+        if wi == 0:
+            self._first_time = pkt_time
+        self._last_time = pkt_time
+        self._write_index = wi + 1
+
+    def handle_raw_frame(self, pkt_time, pkt_bytes):
+        # Same as handle_frame, but for cbsdk.register_group_raw_callback: no packet object is built.
+        wi = self._write_index
+        wp = (wi & self._mask) * ROW_BYTES
+        start = self._header_size
+        if len(pkt_bytes) >= start + ROW_BYTES:
+            self._raw[wp : wp + ROW_BYTES] = pkt_bytes[start : start + ROW_BYTES]
+        if wi == 0:
+            self._first_time = pkt_time
+        self._last_time = pkt_time
+        self._write_index = wi + 1
+
+    def handle_frame_batch(self, times, samples):
+        # For cbsdk.register_group_batch_callback: one vectorized copy per batch of frames.
+        n = len(times)
+        if n == 0:
+            return
+        wi = self._write_index
+        # Only the last `capacity` frames of an (unusually) large batch would survive anyway.
+        rows = samples[-(self._mask + 1) :, :N_KEEP]
+        n_rows = len(rows)
+        ri = (wi + n - n_rows) & self._mask
+        n_tail = min(n_rows, self._mask + 1 - ri)
+        self._buffer[ri : ri + n_tail] = rows[:n_tail]
+        self._buffer[: n_rows - n_tail] = rows[n_tail:]
+        if wi == 0:
+            self._first_time = int(times[0])
+        self._last_time = int(times[-1])
+        self._write_index = wi + n
 
     def finish(self):
-        b_ts = self._ts > 0
-        if np.any(b_ts):
-            avg_isi = np.mean(np.diff(self._ts[b_ts]))
-            ts_elapsed = self._ts[b_ts][-1] - self._ts[b_ts][0] + avg_isi
+        n_samps = self._write_index
+        if n_samps > 1:
+            # The mean of consecutive differences telescopes to (last - first) / (n - 1).
+            avg_isi = (self._last_time - self._first_time) / (n_samps - 1)
+            ts_elapsed = self._last_time - self._first_time + avg_isi
             s_elapsed = ts_elapsed * self._t_step
-            n_samps = np.sum(b_ts)
             print(
                 f"Collected {n_samps} samples in {s_elapsed} s\t({n_samps/s_elapsed:.2f} Hz)."
             )
@@ -45,14 +102,16 @@ def main(
     inst_port: int = 51002,
     client_addr: str = "",
     client_port: int = 51002,
-    recv_bufsize: int = (8 if sys.platform == "win32" else 6) * 1024 * 1024,
+    recv_bufsize: int = 12 * 1024 * 1024,
     protocol: str = "4.1",
-    loglevel: str = "debug",
+    loglevel: str = "warning",
+    callback: str = "batch",
 ):
     """
     Run the application:
     - Configure the connection to the nsp
     - Create an app, then register it is a callback that receives smp frames and updates internal state
+    :param callback: "batch" (arrays of frames), "raw" (packet bytes), or "packet" (packet objects).
     """
     # Handle logger arguments
     loglevel = {
@@ -85,12 +144,27 @@ def main(
     _ = cbsdk.set_channel_config(nsp_obj, 1, "smpgroup", smpgroup)
 
     # Create a dummy app.
-    app = DummyApp(duration=duration, t_step=1 / config["sysfreq"])
+    app = DummyApp(
+        t_step=1 / config["sysfreq"],
+        header_size=nsp_obj.packet_factory.header_size,
+    )
 
-    time.sleep(2.0)
+    # Wait for the device to acknowledge the configuration rather than sleeping for a fixed time.
+    if not cbsdk.wait_config_applied(nsp_obj, timeout=2.0):
+        logger.warning(
+            "Timed out waiting for the device to apply the channel configuration."
+        )
 
     # Register callbacks to update the app's state when appropriate packets are received.
-    _ = cbsdk.register_group_callback(nsp_obj, smpgroup, app.handle_frame)
+    #  The batch and raw callbacks receive frames without any packet objects being constructed.
+    if callback == "batch":
+        _ = cbsdk.register_group_batch_callback(
+            nsp_obj, smpgroup, app.handle_frame_batch
+        )
+    elif callback == "raw":
+        _ = cbsdk.register_group_raw_callback(nsp_obj, smpgroup, app.handle_raw_frame)
+    else:
+        _ = cbsdk.register_group_callback(nsp_obj, smpgroup, app.handle_frame)
 
     t_start = time.time()
     try:
@@ -2,54 +2,137 @@ import sys
 import logging
 from pycbsdk import cbsdk
 import time
-from collections import deque
 import numpy as np
 
+#  TODO: We should have API functions to check channel capabilities instead of
+#   importing from pycbsdk.cbhw and doing bitwise testing here
+from pycbsdk.cbhw.device.nsp import CBAInpSpk
+from pycbsdk.cbhw.packet.common import CBChannelType
 
 logger = logging.getLogger(__name__)
 
+# Plain-int flag values, so the per-channel checks don't go through enum attribute lookups.
+SPK_EXTRACT = CBAInpSpk.EXTRACT.value
+SPK_THRAUTO = CBAInpSpk.THRAUTO.value
+
 
 class DummyApp:
-    def __init__(self, n_chans, history=1.0, tstep=(1 / 30_000)):
+    def __init__(
+        self,
+        n_chans,
+        history=1.0,
+        tstep=(1 / 30_000),
+        buffer_size=1 << 16,
+        chix_of=None,
+    ):
         self._n_chans = n_chans
+        # Lookup table from 1-based chid to 0-based channel index. Default: chix = chid - 1.
+        if chix_of is None:
+            chix_of = np.arange(-1, n_chans, dtype=np.int16)
+        self._chix_of = chix_of
         self._hist_dur = history
         self._cutoff_steps = round(self._hist_dur / tstep)
+        self._buffer_size = buffer_size
         self._spike_times, self._spike_chans, self._spike_counts = None, None, None
+        self._head, self._tail = 0, 0
         self._frames = None
         self.reset_state()
 
     def reset_state(self):
-        # Time of spike events in order received.
-        self._spike_times = deque()
-        # Channel of spike event in order received.
-        self._spike_chans = deque()
+        # Buffers of spike events in order received. Live events are in [self._head, self._tail).
+        # Time of spike events.
+        self._spike_times = np.empty(self._buffer_size, dtype=np.int64)
+        # 0-based channel index of spike events.
+        self._spike_chans = np.empty(self._buffer_size, dtype=np.int16)
+        self._head, self._tail = 0, 0
         # Number of spikes in buffer for each channel:
-        self._spike_counts = [0] * self._n_chans
+        self._spike_counts = np.zeros(self._n_chans, dtype=np.int32)
+
+    def _evict(self, new_head: int):
+        # One histogram of the evicted channels; much cheaper than np.subtract.at for bursts.
+        self._spike_counts -= np.bincount(
+            self._spike_chans[self._head : new_head], minlength=self._n_chans
+        )
+        self._head = new_head
+
+    def _evict_stale(self):
+        # Drop events older than the history window before the newest event.
+        #  Times are sorted so the cutoff is one search.
+        if self._tail > self._head:
+            cutoff = self._spike_times[self._tail - 1] - self._cutoff_steps
+            if self._spike_times[self._head] < cutoff:
+                self._evict(
+                    self._head
+                    + int(
+                        np.searchsorted(
+                            self._spike_times[self._head : self._tail],
+                            cutoff,
+                            side="left",
+                        )
+                    )
+                )
+
+    def _make_room(self, n_new: int = 1):
+        # Move live events to the front of the buffers, growing them if needed to fit n_new more.
+        self._evict_stale()
+        n_live = self._tail - self._head
+        times, chans = self._spike_times, self._spike_chans
+        if n_live + n_new > len(times):
+            new_size = max(2 * len(times), n_live + n_new)
+            times = np.empty(new_size, dtype=self._spike_times.dtype)
+            chans = np.empty(new_size, dtype=self._spike_chans.dtype)
+        times[:n_live] = self._spike_times[self._head : self._tail]
+        chans[:n_live] = self._spike_chans[self._head : self._tail]
+        self._spike_times, self._spike_chans = times, chans
+        self._head, self._tail = 0, n_live
 
     def update_state(self, spk_pkt):
-        # Packet header chid is 1-based. We need a 0-based for indexing.
-        chix = spk_pkt.header.chid - 1
+        header = spk_pkt.header
+        chix = self._chix_of[header.chid]
+        spk_time = header.time
 
-        # Add new spike events
-        self._spike_times.append(spk_pkt.header.time)
-        self._spike_chans.append(spk_pkt.header.chid)
+        # If the device clock went backwards then all buffered events are stale.
+        if self._tail > self._head and spk_time < self._spike_times[self._tail - 1]:
+            self._evict(self._tail)
+
+        # Add new spike event
+        if self._tail == len(self._spike_times):
+            self._make_room()
+        self._spike_times[self._tail] = spk_time
+        self._spike_chans[self._tail] = chix
+        self._tail += 1
         self._spike_counts[chix] += 1
+        # Old spike events are evicted lazily, in render_state or when the buffer fills.
 
-        # Clear old spike events
-        cutoff = spk_pkt.header.time - self._cutoff_steps
-        while self._spike_chans and (
-            (self._spike_times[0] < cutoff)
-            or (self._spike_times[0] > self._spike_times[-1])
-        ):
-            rem_chix = self._spike_chans.popleft() - 1
-            self._spike_times.popleft()
-            self._spike_counts[rem_chix] -= 1
+    def update_state_batch(self, times, chids, units):
+        # Same as update_state, but for arrays of events. See cbsdk.register_spk_batch_callback.
+        # If the device clock went backwards then everything before the reset is stale.
+        b_reset = np.flatnonzero(times[1:] < times[:-1])
+        if len(b_reset):
+            times, chids = times[b_reset[-1] + 1 :], chids[b_reset[-1] + 1 :]
+            self._evict(self._tail)
+        elif self._tail > self._head and times[0] < self._spike_times[self._tail - 1]:
+            self._evict(self._tail)
+
+        # Add new spike events
+        n_new = len(times)
+        if self._tail + n_new > len(self._spike_times):
+            self._make_room(n_new)
+        new_slice = slice(self._tail, self._tail + n_new)
+        self._spike_times[new_slice] = times
+        self._spike_chans[new_slice] = self._chix_of[chids]
+        self._spike_counts += np.bincount(
+            self._spike_chans[new_slice], minlength=self._n_chans
+        )
+        self._tail += n_new
 
     def render_state(self):
+        self._evict_stale()
+        rates = self._spike_counts / self._hist_dur
         print(
-            f"Firing rate:\t{np.nanmean(self._spike_counts) / self._hist_dur:.2f} Hz "
-            f"+/- {np.nanstd(self._spike_counts) / self._hist_dur:.2f} "  # Not sure if valid?
-            f"({np.nanmin(self._spike_counts) / self._hist_dur:.2f} - {np.nanmax(self._spike_counts) / self._hist_dur:.2f})"
+            f"Firing rate:\t{rates.mean():.2f} Hz "
+            f"+/- {rates.std():.2f} "  # Not sure if valid?
+            f"({rates.min():.2f} - {rates.max():.2f})"
         )
 
 
@@ -58,9 +141,9 @@ def main(
     inst_port: int = 51002,
     client_addr: str = "",
     client_port: int = 51002,
-    recv_bufsize: int = (8 if sys.platform == "win32" else 6) * 1024 * 1024,
+    recv_bufsize: int = 12 * 1024 * 1024,
     protocol: str = "4.1",
-    loglevel: str = "debug",
+    loglevel: str = "warning",
     skip_startup: bool = False,
     update_interval: float = 1.0,
     set_hoops: bool = False,
@@ -123,30 +206,20 @@ def main(
 
     # Print information about current config.
     # Check which channels have spiking enabled and what kind of thresholding they are using.
-    #  TODO: We should have API functions to check channel capabilities instead of
-    #   importing from pycbsdk.cbhw and doing bitwise testing here
-    from pycbsdk.cbhw.device.nsp import CBAInpSpk
-    from pycbsdk.cbhw.packet.common import CBChannelType
-
-    spike_status = {"auto": set(), "manual": set(), "disabled": set()}
-    for chid in [
-        k for k, v in config["channel_types"].items() if v == CBChannelType.FrontEnd
-    ]:
-        pkt = config["channel_infos"][chid]
-        if pkt.spkopts & CBAInpSpk.EXTRACT.value:
-            if pkt.spkopts & CBAInpSpk.THRAUTO.value:
-                spike_status["auto"].add(chid)
-            else:
-                spike_status["manual"].add(chid)
-        else:
-            spike_status["disabled"].add(chid)
-    print(
-        f"Found {len(spike_status['auto']) + len(spike_status['manual'])} channels with spiking enabled "
-        f"and {len(spike_status['disabled'])} with spiking disabled."
+    fe_chids = cbsdk.get_channels_by_type(nsp_obj, CBChannelType.FrontEnd).tolist()
+    spkopts = np.fromiter(
+        (config["channel_infos"][chid].spkopts for chid in fe_chids),
+        dtype=np.uint32,
+        count=len(fe_chids),
     )
+    b_extract = (spkopts & SPK_EXTRACT) != 0
+    n_extract = np.count_nonzero(b_extract)
+    n_auto = np.count_nonzero(b_extract & ((spkopts & SPK_THRAUTO) != 0))
     print(
-        f"{len(spike_status['auto'])} of the spike-enabled channels are using auto-thresholding."
+        f"Found {n_extract} channels with spiking enabled "
+        f"and {len(fe_chids) - n_extract} with spiking disabled."
     )
+    print(f"{n_auto} of the spike-enabled channels are using auto-thresholding.")
 
     # Enable spiking and disable continuous streams on all analog channels
     for ch_type in [CBChannelType.FrontEnd, CBChannelType.AnalogIn]:
@@ -170,17 +243,25 @@ def main(
         }
         cbsdk.set_channel_spk_config(nsp_obj, 2, "hoops", spk_hoops)
 
-    # Count the number of FrontEnd | AnalogIn channels.
-    b_spk = [
-        _ in [CBChannelType.FrontEnd, CBChannelType.AnalogIn]
-        for _ in config["channel_types"].values()
-    ]
-    n_chans = sum(b_spk)
+    # Map the chids of FrontEnd | AnalogIn channels to contiguous 0-based indices, once.
+    spk_chids = np.union1d(
+        cbsdk.get_channels_by_type(nsp_obj, CBChannelType.FrontEnd),
+        cbsdk.get_channels_by_type(nsp_obj, CBChannelType.AnalogIn),
+    )
+    n_chans = len(spk_chids)
+    chix_of = np.full(spk_chids.max(initial=0) + 1, -1, dtype=np.int16)
+    chix_of[spk_chids] = np.arange(n_chans)
 
     # Create the dummy app.
-    app = DummyApp(n_chans, history=update_interval, tstep=1 / config["sysfreq"])
+    app = DummyApp(
+        n_chans,
+        history=update_interval,
+        tstep=1 / config["sysfreq"],
+        chix_of=chix_of,
+    )
     # Register callbacks to update the app's state when appropriate packets are received.
-    _ = cbsdk.register_spk_callback(nsp_obj, app.update_state)
+    #  Spikes are delivered in batches, so we don't pay for a Python call and packet object per spike.
+    _ = cbsdk.register_spk_batch_callback(nsp_obj, app.update_state_batch)
 
     # DEBUG: Register a callback to print the heartbeat.
     # _ = cbsdk.register_config_callback(nsp_obj, packet.CBPacketType.SYSHEARTBEAT,
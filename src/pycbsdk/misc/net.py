@@ -1,20 +1,98 @@
-import platform
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+import socket
+import struct
 import subprocess
+import sys
+import time
+from typing import Optional, Sequence
 
 
-def ping(host: str) -> bool:
-    p = platform.platform().lower()
-    if "mac" in p:
-        n = "-c"
-        succ_str = "1 packets received"
-    elif "linux" in p:
-        n = "-c"
-        succ_str = "0% packet loss"
-    else:
-        n = "-n"
-        succ_str = f"Reply from {host}"
-    process = subprocess.Popen(
-        ["ping", n, "1", host], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+# System ping count flag and the output that marks a reply, chosen once per platform.
+#  Also its reply timeout flag and that flag's units per second.
+if sys.platform == "darwin":
+    _PING_COUNT_FLAG, _PING_SUCCESS_FMT = "-c", "1 packets received"
+    _PING_WAIT_FLAG, _PING_WAIT_SCALE = "-W", 1000  # ms
+elif sys.platform.startswith("linux"):
+    _PING_COUNT_FLAG, _PING_SUCCESS_FMT = "-c", "0% packet loss"
+    _PING_WAIT_FLAG, _PING_WAIT_SCALE = "-W", 1  # s; older iputils only take integers.
+else:
+    _PING_COUNT_FLAG, _PING_SUCCESS_FMT = "-n", "Reply from {host}"
+    _PING_WAIT_FLAG, _PING_WAIT_SCALE = "-w", 1000  # ms
+
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_ping(host: str, timeout: float) -> bool:
+    # Unprivileged ICMP (SOCK_DGRAM) sockets are available on macOS, and on Linux when the user's
+    #  group is in net.ipv4.ping_group_range. Otherwise this raises an OSError.
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP) as sock:
+        ident = os.getpid() & 0xFFFF  # Linux replaces this with its own id.
+        payload = struct.pack("!d", time.time())
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, 1)
+        checksum = _icmp_checksum(header + payload)
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, 1)
+        sock.sendto(header + payload, (host, 0))
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            sock.settimeout(remaining)
+            try:
+                data, addr = sock.recvfrom(1024)
+            except socket.timeout:
+                return False
+            if data and data[0] >> 4 == 4:
+                # macOS includes the IP header; skip it.
+                data = data[(data[0] & 0x0F) * 4 :]
+            if addr[0] == host and data and data[0] == ICMP_ECHO_REPLY:
+                return True
+
+
+def _subprocess_ping(host: str, timeout: float) -> bool:
+    wait = max(1, math.ceil(timeout * _PING_WAIT_SCALE))
+    # The system ping's own timeout covers only the reply; the backstop also covers its startup.
+    process = subprocess.run(
+        ["ping", _PING_COUNT_FLAG, "1", _PING_WAIT_FLAG, str(wait), host],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=wait / _PING_WAIT_SCALE + 1.0,
     )
-    streamdata = process.communicate()[0]
-    return succ_str in str(streamdata)
+    return _PING_SUCCESS_FMT.format(host=host) in str(process.stdout)
+
+
+def ping(host: str, timeout: float = 0.1) -> bool:
+    try:
+        return _icmp_ping(host, timeout)
+    except OSError:
+        pass
+    # No unprivileged ICMP sockets here (e.g. Windows); fall back to the system ping.
+    try:
+        return _subprocess_ping(host, timeout)
+    except (OSError, subprocess.SubprocessError):
+        # No usable ping executable, or it hung; treat the host as unresponsive.
+        return False
+
+
+def find_responsive_host(hosts: Sequence[str], timeout: float = 0.1) -> Optional[str]:
+    """
+    Ping all hosts concurrently.
+    :return: the first host (in the given order) that replied, or None.
+    """
+    with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+        replies = list(executor.map(lambda _: ping(_, timeout), hosts))
+    for host, b_reply in zip(hosts, replies):
+        if b_reply:
+            return host
+    return None
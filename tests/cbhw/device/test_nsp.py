@@ -0,0 +1,397 @@
+from pycbsdk.cbhw import config
+
+config.protocol = "4.1"
+import threading
+import time
+
+from pycbsdk.cbhw.device import nsp
+from pycbsdk.cbhw.device.nsp import (
+    CBAInpSpk,
+    CBAnaInpOpts,
+    CBChanCaps,
+    CBRunLevel,
+    NSPDevice,
+)
+from pycbsdk.cbhw.packet.common import CBChannelType, CBPacketType, CBSpecialChan
+from pycbsdk.cbhw.packet.factory import CBPacketFactory
+from pycbsdk.cbhw.packet.pool import PacketPool
+from pycbsdk.cbhw.params import Params
+
+from pycbsdk.cbhw.packet import packets
+
+
+class FakeIO:
+    """Stands in for the datagram thread; records the packets sent to the device."""
+
+    def __init__(self, dev: NSPDevice):
+        self._dev = dev
+        self.sent = []
+
+    def send(self, pkt_bytes: bytes):
+        self.sent.append(self._dev.packet_factory.make_packet(pkt_bytes))
+
+
+def make_device(n_chans: int = 0) -> NSPDevice:
+    dev = NSPDevice(Params(inst_addr="127.0.0.1", client_addr="127.0.0.1"))
+    dev._io_thread = FakeIO(dev)
+    for chid in range(1, n_chans + 1):
+        dev._handle_chaninfo(make_chanrep(dev, chid))
+    return dev
+
+
+def make_chanrep(dev: NSPDevice, chid: int, pkt_type=CBPacketType.CHANREP):
+    pkt = dev.packet_factory.make_packet(
+        None, chid=CBSpecialChan.CONFIGURATION, pkt_type=CBPacketType.CHANREP
+    )
+    pkt.chan = chid
+    pkt.header.type = pkt_type
+    return pkt
+
+
+def make_nplay(fname: str) -> bytes:
+    pkt = packets.CBPacketNPlay()
+    pkt.header.type = CBPacketType.NPLAYREP
+    pkt.fname = fname
+    return bytes(pkt)
+
+
+def test_nplay_kept_after_pool_slot_reuse():
+    dev = make_device()
+    pool_factory = CBPacketFactory(protocol="4.1", pool=PacketPool(n_slots=1))
+    dev._handle_nplay(pool_factory.make_packet(make_nplay("first.ns6")))
+    # With a single slot, the next packet overwrites the one just handled.
+    pool_factory.make_packet(make_nplay("second.ns6"))
+    assert dev.config["nplay"].fname == "first.ns6"
+
+
+def test_wait_config_applied_blocks_until_matching_reply():
+    dev = make_device(n_chans=2)
+    # A reply that arrived before this configuration must not satisfy the wait.
+    dev._config_events["chaninfo"].set()
+    dev.configure_channel(1, "smpgroup", 2, timeout=0)
+    assert dev._io_thread.sent[-1].header.type == CBPacketType.CHANSETSMP
+
+    done = threading.Event()
+    result = []
+    waiter = threading.Thread(
+        target=lambda: (result.append(dev.wait_config_applied(timeout=2.0)), done.set())
+    )
+    waiter.start()
+    # Replies for another channel, or of another type for this channel, do not count.
+    dev._handle_chaninfo(make_chanrep(dev, 2, CBPacketType.CHANREPSMP))
+    dev._handle_chaninfo(make_chanrep(dev, 1, CBPacketType.CHANREPAINP))
+    assert not done.wait(timeout=0.1)
+    dev._handle_chaninfo(make_chanrep(dev, 1, CBPacketType.CHANREPSMP))
+    waiter.join(timeout=1.0)
+    assert result == [True]
+
+
+def test_wait_config_applied_times_out_without_reply():
+    dev = make_device(n_chans=1)
+    dev.configure_channel(1, "smpgroup", 2, timeout=0)
+    assert not dev.wait_config_applied(timeout=0.05)
+    # The lost reply is forgotten, so the next wait does not inherit it.
+    assert dev.wait_config_applied(timeout=0)
+
+
+def run_in_thread(func) -> tuple[threading.Thread, list]:
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    return thread, result
+
+
+def wait_sent(dev: NSPDevice, n_pkts: int):
+    """Wait until n_pkts have been sent, so that replies to them are not early."""
+    deadline = time.monotonic() + 1.0
+    while len(dev._io_thread.sent) < n_pkts and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert len(dev._io_thread.sent) == n_pkts
+
+
+def test_configure_channels_waits_for_every_reply_per_channel():
+    dev = make_device(n_chans=2)
+    # smpgroup 6 sends an AINP packet then an SMP packet for each channel.
+    thread, result = run_in_thread(
+        lambda: dev.configure_channels([1, 2], "smpgroup", 6, timeout=2.0)
+    )
+    wait_sent(dev, 4)
+    for chid in (1, 2):
+        dev._handle_chaninfo(make_chanrep(dev, chid, CBPacketType.CHANREPAINP))
+    thread.join(timeout=0.1)
+    assert thread.is_alive()
+    assert [pkt.header.type for pkt in dev._io_thread.sent] == [
+        CBPacketType.CHANSETAINP,
+        CBPacketType.CHANSETSMP,
+    ] * 2
+    for chid in (1, 2):
+        dev._handle_chaninfo(make_chanrep(dev, chid, CBPacketType.CHANREPSMP))
+    thread.join(timeout=1.0)
+    assert result == [True]
+
+
+def test_configure_channels_spike_waits_for_matching_reply():
+    dev = make_device(n_chans=2)
+    thread, result = run_in_thread(
+        lambda: dev.configure_channels_spike([1, 2], "enable", True, timeout=2.0)
+    )
+    wait_sent(dev, 2)
+    # Replies of another type do not acknowledge the spike configuration.
+    for chid in (1, 2):
+        dev._handle_chaninfo(make_chanrep(dev, chid, CBPacketType.CHANREPSMP))
+    dev._handle_chaninfo(make_chanrep(dev, 1, CBPacketType.CHANREPSPK))
+    thread.join(timeout=0.1)
+    assert thread.is_alive()
+    dev._handle_chaninfo(make_chanrep(dev, 2, CBPacketType.CHANREPSPK))
+    thread.join(timeout=1.0)
+    assert result == [True]
+
+
+def test_configure_channels_times_out_on_missing_reply():
+    dev = make_device(n_chans=2)
+    thread, result = run_in_thread(
+        lambda: dev.configure_channels([1, 2], "smpgroup", 2, timeout=0.1)
+    )
+    wait_sent(dev, 2)
+    dev._handle_chaninfo(make_chanrep(dev, 1, CBPacketType.CHANREPSMP))
+    thread.join(timeout=1.0)
+    assert result == [False]
+    # The lost reply is forgotten, so the next wait does not inherit it.
+    assert dev.wait_config_applied(timeout=0)
+
+
+def test_get_channels_by_type_follows_chancaps():
+    dev = make_device()
+    fe_caps = CBChanCaps.isolated | CBChanCaps.ainp
+    for chid, caps in [(1, fe_caps), (2, fe_caps), (3, CBChanCaps.ainp)]:
+        pkt = make_chanrep(dev, chid)
+        pkt.chancaps = caps
+        dev._handle_chaninfo(pkt)
+    fe_chids = dev.get_channels_by_type(CBChannelType.FrontEnd)
+    assert fe_chids.tolist() == [1, 2]
+    assert not fe_chids.flags.writeable
+    # Replies that do not change any channel's type keep the cached arrays.
+    dev._handle_chaninfo(make_chanrep(dev, 2, CBPacketType.CHANREPSMP))
+    assert dev.get_channels_by_type(CBChannelType.FrontEnd) is fe_chids
+
+    pkt = make_chanrep(dev, 2)
+    pkt.chancaps = CBChanCaps.ainp
+    dev._handle_chaninfo(pkt)
+    assert dev.get_channels_by_type(CBChannelType.FrontEnd).tolist() == [1]
+    assert dev.get_channels_by_type(CBChannelType.AnalogIn).tolist() == [2, 3]
+
+    pkt = make_chanrep(dev, 4)
+    pkt.chancaps = fe_caps
+    dev._handle_chaninfo(pkt)
+    assert dev.get_channels_by_type(CBChannelType.FrontEnd).tolist() == [1, 4]
+    assert len(dev.get_channels_by_type(CBChannelType.DigitalIn)) == 0
+
+
+def test_global_lnc_waits_for_lncrep():
+    dev = make_device(n_chans=1)
+
+    def reply():
+        wait_sent(dev, 1)
+        lncrep = dev.packet_factory.make_packet(bytes(dev._io_thread.sent[0]))
+        lncrep.header.type = CBPacketType.LNCREP
+        dev._handle_lnc(lncrep)
+
+    replier = threading.Thread(target=reply)
+    replier.start()
+    dev.configure_channel(1, "global_lnc", 50, timeout=1.0)
+    replier.join()
+    sent = dev._io_thread.sent[0]
+    assert sent.header.type == CBPacketType.LNCSET
+    assert (sent.lncFreq, sent.lncRefChan) == (50, 1)
+    assert dev.config["lnc"].lncFreq == 50
+
+
+def test_lost_reply_does_not_hold_up_later_configure():
+    dev = make_device(n_chans=1)
+    # Nothing answers this packet; its wait times out.
+    dev.configure_channel_by_packet(make_chanrep(dev, 1))
+    assert dev._chanrep_expected == {}
+
+    def reply():
+        wait_sent(dev, 2)
+        dev._handle_chaninfo(make_chanrep(dev, 1, CBPacketType.CHANREPSPK))
+
+    replier = threading.Thread(target=reply)
+    replier.start()
+    # Raises if it waits for the lost reply instead of its own.
+    dev.configure_channel(1, "spkfilter", 3, timeout=1.0)
+    replier.join()
+    assert dev.wait_config_applied(timeout=0)
+
+
+def test_configure_channel_disable_clears_option_bits():
+    dev = make_device()
+    other_ainp_bit = 0x10000000  # Not an option disable touches.
+    pkt = make_chanrep(dev, 1)
+    pkt.ainpopts = (
+        other_ainp_bit
+        | CBAnaInpOpts.lnc_runsoft
+        | CBAnaInpOpts.refelec_spk
+        | CBAnaInpOpts.refelec_rawstream
+        | CBAnaInpOpts.refelec_offsetcorrect
+    )
+    pkt.spkopts = CBAInpSpk.EXTRACT | CBAInpSpk.THRAUTO | CBAInpSpk.HOOPSORT
+    pkt.smpgroup = 2
+    pkt.smpfilter = 3
+    dev._handle_chaninfo(pkt)
+
+    dev.configure_channel_disable(1)
+    (sent,) = dev._io_thread.sent
+    assert sent.header.type == CBPacketType.CHANSET
+    assert sent.ainpopts == other_ainp_bit
+    assert sent.spkopts == CBAInpSpk.HOOPSORT
+    assert (sent.smpgroup, sent.smpfilter) == (0, 0)
+
+
+def test_configure_channel_disable_skips_disabled_channel():
+    dev = make_device()
+    pkt = make_chanrep(dev, 1)
+    pkt.spkopts = CBAInpSpk.HOOPSORT
+    dev._handle_chaninfo(pkt)
+    dev.configure_channel_disable(1)
+    assert dev._io_thread.sent == []
+
+    # Still sampled: the options are already clear, but smpgroup is not.
+    pkt.smpgroup = 1
+    dev._handle_chaninfo(pkt)
+    dev.configure_channel_disable(1)
+    (sent,) = dev._io_thread.sent
+    assert sent.smpgroup == 0
+
+
+def test_enable_spike_logs_missing_reply(caplog):
+    dev = make_device(n_chans=1)
+    dev.configure_channel_spike(1, "enable", True, timeout=0.01)
+    assert "Channel 1 did not acknowledge" in caplog.text
+
+    caplog.clear()
+    thread, _ = run_in_thread(
+        lambda: dev.configure_channel_spike(1, "enable", False, timeout=1.0)
+    )
+    wait_sent(dev, 2)
+    dev._handle_chaninfo(make_chanrep(dev, 1, CBPacketType.CHANREPSPK))
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert caplog.text == ""
+
+
+# Chaninfo fields that each limited-scope CHANREP* reply updates.
+CHANREP_FIELDS = {
+    CBPacketType.CHANREPAINP: {"ainpopts", "lncrate", "refelecchan"},
+    CBPacketType.CHANREPSPK: {"spkopts", "spkfilter"},
+    CBPacketType.CHANREPREJECTAMPLITUDE: {"spkopts", "amplrejpos", "amplrejneg"},
+    CBPacketType.CHANREPAUTOTHRESHOLD: {"spkopts"},
+    CBPacketType.CHANREPSMP: {"smpfilter", "smpgroup"},
+    CBPacketType.CHANREPSPKHPS: {"spkhoops"},
+    CBPacketType.CHANREPAOUT: {"aoutopts"},
+    CBPacketType.CHANREPSCALE: {"scalin", "scalout"},
+    CBPacketType.CHANREPDINP: {"dinpopts", "eopchar"},
+    CBPacketType.CHANREPDOUT: {"doutopts", "doutcaps"},
+    CBPacketType.CHANREPLABEL: {"label", "userflags"},
+    CBPacketType.CHANREPSPKTHR: {"spkthrlevel"},
+}
+
+
+def test_chanrep_copies_only_scoped_fields():
+    dev = make_device(n_chans=1)
+    chaninfo_cls = type(dev.config["channel_infos"][1])
+    header_size = dev.packet_factory.header_size
+    for pkt_type, fields in CHANREP_FIELDS.items():
+        before = bytes(dev.config["channel_infos"][1])
+        # A reply whose every payload byte differs from the stored chaninfo.
+        reply = chaninfo_cls.from_buffer_copy(
+            before[:header_size]
+            + bytes(
+                ((_ + pkt_type) % 255) + 1 for _ in range(len(before) - header_size)
+            )
+        )
+        reply.chan = 1
+        reply.header.type = pkt_type
+        dev._handle_chaninfo(reply)
+        after = bytes(dev.config["channel_infos"][1])
+        for name, _ in chaninfo_cls._fields_:
+            field = getattr(chaninfo_cls, name)
+            span = slice(field.offset, field.offset + field.size)
+            if name in fields:
+                assert after[span] == bytes(reply)[span], (pkt_type, name)
+            else:
+                assert after[span] == before[span], (pkt_type, name)
+
+
+def test_channels_by_type_after_partial_config_refresh():
+    dev = make_device()
+    for chid in (1, 2, 3):
+        pkt = make_chanrep(dev, chid)
+        pkt.chancaps = CBChanCaps.isolated | CBChanCaps.ainp
+        dev._handle_chaninfo(pkt)
+    assert dev.get_channels_by_type(CBChannelType.FrontEnd).tolist() == [1, 2, 3]
+
+    # Nothing answers the REQCONFIGALL, and then only one CHANREP arrives.
+    assert dev.get_config(timeout=0.01, force_refresh=True) is None
+    assert len(dev.get_channels_by_type(CBChannelType.FrontEnd)) == 0
+    pkt = make_chanrep(dev, 2)
+    pkt.chancaps = CBChanCaps.isolated | CBChanCaps.ainp
+    dev._handle_chaninfo(pkt)
+    assert dev.get_channels_by_type(CBChannelType.FrontEnd).tolist() == [2]
+
+    n_sent = len(dev._io_thread.sent)
+    dev.configure_all_channels(CBChannelType.FrontEnd, "smpgroup", 1, timeout=0)
+    assert [_.chan for _ in dev._io_thread.sent[n_sent:]] == [2]
+
+
+def test_resolve_ipv4_parses_numeric_addresses(monkeypatch):
+    def no_resolver(host):
+        raise AssertionError(f"resolver called for {host}")
+
+    monkeypatch.setattr(nsp.socket, "gethostbyname", no_resolver)
+    for addr in ("192.168.137.128", "0.0.0.0", "255.255.255.255"):
+        assert nsp._resolve_ipv4(addr) == addr
+
+
+def test_resolve_ipv4_falls_back_to_resolver(monkeypatch):
+    looked_up = []
+
+    def resolver(host):
+        looked_up.append(host)
+        return "10.0.0.7"
+
+    monkeypatch.setattr(nsp.socket, "gethostbyname", resolver)
+    assert nsp._resolve_ipv4("nsp.local") == "10.0.0.7"
+    assert looked_up == ["nsp.local"]
+
+
+def test_concurrent_get_config_shares_one_request():
+    dev = make_device()
+    first, first_result = run_in_thread(lambda: dev.get_config(timeout=2.0))
+    wait_sent(dev, 1)
+    assert dev._io_thread.sent[0].header.type == CBPacketType.REQCONFIGALL
+    second, second_result = run_in_thread(lambda: dev.get_config(timeout=2.0))
+    # Give the second caller time to find the request already in flight.
+    second.join(timeout=0.1)
+    assert second.is_alive()
+
+    make_packet = dev.packet_factory.make_packet
+    procrep = make_packet(
+        None, chid=CBSpecialChan.CONFIGURATION, pkt_type=CBPacketType.PROCREP
+    )
+    procrep.chancount = 2
+    dev._handle_procinfo(procrep)
+    for chid in (1, 2):
+        dev._handle_chaninfo(make_chanrep(dev, chid))
+    sysrep = make_packet(
+        None, chid=CBSpecialChan.CONFIGURATION, pkt_type=CBPacketType.SYSREP
+    )
+    sysrep.runlevel = CBRunLevel.RUNNING
+    dev._handle_sysrep(sysrep)
+    first.join(timeout=1.0)
+    second.join(timeout=1.0)
+
+    assert len(dev._io_thread.sent) == 1
+    for result in (first_result, second_result):
+        assert len(result) == 1 and result[0] is not None
+        assert sorted(result[0]["channel_infos"]) == [1, 2]
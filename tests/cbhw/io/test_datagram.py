@@ -0,0 +1,203 @@
+from pycbsdk.cbhw import config
+
+config.protocol = "4.1"
+import asyncio
+from collections import deque
+import logging
+import socket
+
+import pytest
+
+from pycbsdk.cbhw.io import datagram
+from pycbsdk.cbhw.packet import packets
+
+
+class FakeSock:
+    """Records socket options; refuses SO_RCVBUFFORCE or SO_RCVBUF sizes as configured."""
+
+    def __init__(self, b_force_ok: bool = True, max_rcvbuf=None, cap_rcvbuf=None):
+        self.b_force_ok = b_force_ok
+        self.max_rcvbuf = max_rcvbuf  # Larger SO_RCVBUF requests raise, like macOS.
+        self.cap_rcvbuf = (
+            cap_rcvbuf  # Larger SO_RCVBUF requests are capped, like Linux.
+        )
+        self.opts = []
+        self.rcvbuf = 0
+
+    def setsockopt(self, level, opt, value):
+        self.opts.append((opt, value))
+        if opt == datagram.SO_RCVBUFFORCE:
+            if not self.b_force_ok:
+                raise PermissionError("needs CAP_NET_ADMIN")
+            self.rcvbuf = value
+        elif opt == socket.SO_RCVBUF:
+            if self.max_rcvbuf is not None and value > self.max_rcvbuf:
+                raise OSError("ENOBUFS")
+            self.rcvbuf = min(value, self.cap_rcvbuf or value)
+
+    def getsockopt(self, level, opt):
+        assert opt == socket.SO_RCVBUF
+        # Linux reports double the usable size.
+        return 2 * self.rcvbuf if datagram.sys.platform == "linux" else self.rcvbuf
+
+
+def make_datagram(*pkt_times: int) -> bytes:
+    data = b""
+    for pkt_time in pkt_times:
+        header = packets.CBPacketHeader()
+        header.time = pkt_time
+        header.chid = 5
+        header.type = 1
+        header.dlen = 2
+        data += bytes(header) + b"\x01\x02\x03\x04\x05\x06\x07\x08"
+    return data
+
+
+@pytest.fixture
+def udp_pair():
+    recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    recv_sock.bind(("127.0.0.1", 0))
+    recv_sock.setblocking(False)
+    send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    yield recv_sock, send_sock
+    recv_sock.close()
+    send_sock.close()
+
+
+def test_set_recv_bufsize_forced(monkeypatch, caplog):
+    monkeypatch.setattr(datagram.sys, "platform", "linux")
+    sock = FakeSock()
+    assert datagram.set_recv_bufsize(sock, 1 << 20) == 1 << 20
+    assert sock.opts == [(datagram.SO_RCVBUFFORCE, 1 << 20)]
+    assert "WARNING" not in caplog.text
+
+
+def test_set_recv_bufsize_falls_back_and_warns_when_capped(monkeypatch, caplog):
+    monkeypatch.setattr(datagram.sys, "platform", "linux")
+    sock = FakeSock(b_force_ok=False, cap_rcvbuf=1 << 18)
+    assert datagram.set_recv_bufsize(sock, 1 << 20) == 1 << 18
+    assert sock.opts == [
+        (datagram.SO_RCVBUFFORCE, 1 << 20),
+        (socket.SO_RCVBUF, 1 << 20),
+    ]
+    assert f"net.core.rmem_max={1 << 20}" in caplog.text
+
+
+def test_set_recv_bufsize_halves_on_refusal(monkeypatch, caplog):
+    monkeypatch.setattr(datagram.sys, "platform", "darwin")
+    sock = FakeSock(max_rcvbuf=1 << 18)
+    assert datagram.set_recv_bufsize(sock, 1 << 20) == 1 << 18
+    assert sock.opts == [
+        (socket.SO_RCVBUF, 1 << 20),
+        (socket.SO_RCVBUF, 1 << 19),
+        (socket.SO_RCVBUF, 1 << 18),
+    ]
+    assert "kern.ipc.maxsockbuf" in caplog.text
+
+
+def test_set_low_latency_opts(monkeypatch, caplog):
+    monkeypatch.setattr(datagram.sys, "platform", "linux")
+    affinities = []
+    monkeypatch.setattr(
+        datagram.os,
+        "sched_setaffinity",
+        lambda pid, cpus: affinities.append((pid, cpus)),
+        raising=False,
+    )
+    sock = FakeSock()
+    datagram.set_low_latency_opts(sock, busy_poll_us=50, pin_cpu=3)
+    assert sock.opts == [(datagram.SO_BUSY_POLL, 50), (datagram.SO_INCOMING_CPU, 3)]
+    assert affinities == [(0, {3})]
+    assert "WARNING" not in caplog.text
+
+
+def test_set_low_latency_opts_logs_failures(monkeypatch, caplog):
+    monkeypatch.setattr(datagram.sys, "platform", "linux")
+
+    class RefusingSock(FakeSock):
+        def setsockopt(self, level, opt, value):
+            raise PermissionError("denied")
+
+    datagram.set_low_latency_opts(RefusingSock(), busy_poll_us=50, pin_cpu=3)
+    assert "Could not set SO_BUSY_POLL=50" in caplog.text
+    assert "Could not pin receive thread to CPU 3" in caplog.text
+
+    caplog.clear()
+    monkeypatch.setattr(datagram.sys, "platform", "win32")
+    sock = FakeSock()
+    datagram.set_low_latency_opts(sock, busy_poll_us=50)
+    assert sock.opts == []
+    assert "only supported on Linux" in caplog.text
+
+
+def test_set_thread_priority_falls_back_with_warning(monkeypatch, caplog):
+    monkeypatch.setattr(datagram.sys, "platform", "linux")
+    calls = []
+
+    def refuse(pid, policy, param):
+        calls.append(pid)
+        raise PermissionError("needs CAP_SYS_NICE")
+
+    monkeypatch.setattr(datagram.os, "sched_setscheduler", refuse, raising=False)
+    monkeypatch.setattr(datagram.os, "SCHED_FIFO", 1, raising=False)
+    monkeypatch.setattr(datagram.os, "sched_param", lambda p: p, raising=False)
+    datagram.set_thread_priority(None)
+    assert calls == []
+    datagram.set_thread_priority(10)
+    assert calls == [0]
+    assert "Could not set SCHED_FIFO priority 10" in caplog.text
+
+
+def test_sock_readable_drains_socket(udp_pair):
+    recv_sock, send_sock = udp_pair
+    queue = deque()
+    protocol = datagram.CerebusDatagramProtocol(None, "4.1", queue)
+    send_sock.sendto(make_datagram(1, 2), recv_sock.getsockname())
+    send_sock.sendto(make_datagram(3), recv_sock.getsockname())
+    protocol.sock_readable(recv_sock)
+    assert [_[0] for _ in queue] == [1, 2, 3]
+    _pkt_time, chid, pkt_type, dlen, data = queue[0]
+    assert (chid, pkt_type, dlen) == (5, 1, 2)
+    assert data == make_datagram(1)
+
+
+def test_sock_readable_warns_on_truncation(udp_pair, caplog):
+    recv_sock, send_sock = udp_pair
+    queue = deque()
+    protocol = datagram.CerebusDatagramProtocol(None, "4.1", queue)
+    # Shrink the receive buffer so that a two-packet datagram does not fit.
+    pkt_size = len(make_datagram(1))
+    protocol._recv_buf = bytearray(pkt_size)
+    protocol._recv_view = memoryview(protocol._recv_buf)
+    send_sock.sendto(make_datagram(1, 2), recv_sock.getsockname())
+    with caplog.at_level(logging.WARNING):
+        protocol.sock_readable(recv_sock)
+    assert f"truncated to {pkt_size} bytes" in caplog.text
+    assert [_[0] for _ in queue] == [1]
+
+
+def test_recv_into_transport(udp_pair):
+    recv_sock, send_sock = udp_pair
+    queue = deque()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        con_lost = loop.create_future()
+        protocol = datagram.CerebusDatagramProtocol(con_lost, "4.1", queue)
+        transport = datagram.RecvIntoDatagramTransport(loop, recv_sock, protocol)
+        send_sock.sendto(make_datagram(1, 2), recv_sock.getsockname())
+        for _ in range(100):
+            if queue:
+                break
+            await asyncio.sleep(0.01)
+        transport.close()
+        assert transport.is_closing()
+        await asyncio.wait_for(con_lost, timeout=1.0)
+
+    loop = asyncio.SelectorEventLoop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert [_[0] for _ in queue] == [1, 2]
+    assert recv_sock.fileno() == -1  # Closed by the transport.
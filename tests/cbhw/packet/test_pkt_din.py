@@ -0,0 +1,36 @@
+import struct
+
+import numpy as np
+
+from pycbsdk.cbhw import config
+
+config.protocol = "4.1"
+from pycbsdk.cbhw.packet import v311
+
+
+def test_pkt_din_v311_as_ndarray():
+    values = [0, 1, 0xFFFFFFFF]
+    pkt = _make_din(values)
+    arr = pkt.as_ndarray()
+    assert arr.dtype == np.dtype("<u4")
+    assert len(arr) == pkt.header.dlen == len(values)
+    assert arr.tolist() == pkt.data == values
+
+
+def test_pkt_din_v311_as_ndarray_is_view():
+    pkt = _make_din([1, 2, 3])
+    arr = pkt.as_ndarray()
+    assert np.shares_memory(arr, np.frombuffer(pkt._array, dtype="<u4"))
+    arr[0] = 7
+    assert pkt.data[0] == 7
+
+
+def test_pkt_din_v311_as_ndarray_empty():
+    assert len(v311.CBPacketDIn().as_ndarray()) == 0
+
+
+def _make_din(values: list[int]) -> v311.CBPacketDIn:
+    # Parse from bytes, as the handler thread does.
+    header = v311.CBPacketDIn().header
+    header.dlen = len(values)
+    return v311.CBPacketDIn(bytes(header) + struct.pack(f"<{len(values)}I", *values))
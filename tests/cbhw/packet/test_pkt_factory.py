@@ -0,0 +1,52 @@
+from pycbsdk.cbhw.packet.factory import CBPacketFactory
+from pycbsdk.cbhw.packet.common import CBPacketType, CBSpecialChan
+
+factory = CBPacketFactory(protocol="4.1")
+from pycbsdk.cbhw.packet import packets
+
+
+def test_factory_dispatch_by_type():
+    pkt = packets.CBPacketSysInfo()
+    pkt.header.type = CBPacketType.SYSREPRUNLEV
+    new_pkt = factory.make_packet(bytes(pkt))
+    assert isinstance(new_pkt, packets.CBPacketSysInfo)
+
+
+def test_factory_dispatch_unknown_type():
+    pkt = packets.CBPacketGeneric()
+    pkt.header.chid = CBSpecialChan.CONFIGURATION
+    pkt.header.type = 0x1FF  # Not a known type; larger than any config packet type.
+    new_pkt = factory.make_packet(bytes(pkt))
+    assert type(new_pkt) is packets.CBPacketGeneric
+
+
+def test_factory_pool():
+    from pycbsdk.cbhw.packet.pool import PacketPool
+
+    pool_factory = CBPacketFactory(protocol="4.1", pool=PacketPool(n_slots=2))
+    src = packets.CBPacketSpike()
+    src.header.chid = 3
+    src.wave = list(range(10))
+    pkt1 = pool_factory.make_packet(bytes(src), chid=3, pkt_type=0, chantype=1)
+    assert isinstance(pkt1, packets.CBPacketSpike)
+    assert pkt1.header.chid == 3
+    assert list(pkt1.wave) == list(range(10))
+    # The third packet reuses the first slot.
+    pool_factory.make_packet(
+        bytes(packets.CBPacketSpike()), chid=1, pkt_type=0, chantype=1
+    )
+    pool_factory.make_packet(
+        bytes(packets.CBPacketSpike()), chid=1, pkt_type=0, chantype=1
+    )
+    assert pkt1.header.chid == 1
+
+
+def test_factory_group_with_parsed_header():
+    import struct
+
+    # chid 0 (group) with pkt_type already known, as passed by the packet handler.
+    data = struct.pack("<QHHHBB", 123, 0, 6, 1, 0, 0) + struct.pack("<hh", 7, -7)
+    pkt = factory.make_packet(data, chid=0, pkt_type=6)
+    assert isinstance(pkt, packets.CBPacketGroup)
+    assert pkt.header.time == 123
+    assert list(pkt.data) == [7, -7]
@@ -1,8 +1,9 @@
+from ctypes import sizeof
 import struct
 from pycbsdk.cbhw import config
 
 config.protocol = "4.1"
-from pycbsdk.cbhw.packet import packets
+from pycbsdk.cbhw.packet import packets, v311
 
 
 def test_pkt_base_structure():
@@ -31,6 +32,17 @@ def test_pkt_base_init_with_data():
     pkt2 = packets.CBPacketGeneric(bytes(pkt1))
     for pkt in [pkt1, pkt2]:
         assert pkt.data == [int.from_bytes(pkt_bytes[16:], "little")]
+        assert bytes(pkt) == pkt_bytes
+
+
+def test_pkt_varlen_bytes_keeps_char_fields():
+    # char array fields are NUL-terminated when read as attributes, but must be sent whole.
+    pkt = packets.CBPacketLog()
+    pkt.name = b"nsp"
+    pkt.desc = b"hello"
+    pkt_bytes = bytes(pkt)
+    assert len(pkt_bytes) == sizeof(packets.CBPacketLog)
+    assert packets.CBPacketLog(pkt_bytes).desc == b"hello"
 
 
 def test_pkt_base_modify_data():
@@ -43,3 +55,22 @@ def test_pkt_base_modify_data():
     assert pkt.data == new_data
     assert pkt.header.dlen == N
     assert bytes(pkt._array) == struct.pack(f"{N}i", *new_data)
+
+
+def test_pkt_comment_v311_rgba_roundtrip():
+    pkt = v311.CBPacketComment()
+    pkt.rgba = (0x11, 0x22, 0x33, 0x44)
+    assert pkt.rgba == (0x11, 0x22, 0x33, 0x44)
+    # Red is the least significant byte, so it comes first on the (little-endian) wire.
+    assert pkt.data == 0x44332211
+    offset = v311.CBPacketComment.data.offset
+    assert bytes(pkt)[offset : offset + 4] == b"\x11\x22\x33\x44"
+    assert v311.CBPacketComment(bytes(pkt)).rgba == (0x11, 0x22, 0x33, 0x44)
+
+    pkt.rgba = (0xFF, 0xFF, 0xFF, 0xFF)
+    assert pkt.data == 0xFFFFFFFF
+    assert pkt.rgba == (0xFF, 0xFF, 0xFF, 0xFF)
+    assert v311.CBPacketComment(bytes(pkt)).rgba == (0xFF, 0xFF, 0xFF, 0xFF)
+    pkt.rgba = (0, 0, 0, 0)
+    assert pkt.data == 0
+    assert pkt.rgba == (0, 0, 0, 0)
@@ -0,0 +1,249 @@
+from pycbsdk.cbhw import config
+
+config.protocol = "4.1"
+import time
+
+import numpy as np
+
+from pycbsdk import cbsdk
+from pycbsdk.cbhw.device.nsp import NSPDevice
+from pycbsdk.cbhw.handler import EVENT_BATCH_SIZE, PacketHandlerThread
+from pycbsdk.cbhw.packet.common import CBChannelType, CBPacketType, CBSpecialChan
+from pycbsdk.cbhw.params import Params
+
+from pycbsdk.cbhw.packet import packets
+
+SPK_CHIDS = (1, 2)
+AINP_CHID = 3
+
+
+class Recorder:
+    """Batch callback that keeps copies of the (reused) arrays it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, *arrays):
+        self.batches.append(tuple(_.copy() for _ in arrays))
+
+    def wait(self, n_batches: int):
+        deadline = time.monotonic() + 1.0
+        while len(self.batches) < n_batches and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert len(self.batches) == n_batches
+
+
+def make_device() -> NSPDevice:
+    dev = NSPDevice(Params(inst_addr="127.0.0.1", client_addr="127.0.0.1"))
+    for chid in SPK_CHIDS:
+        dev.config["channel_types"][chid] = CBChannelType.FrontEnd
+    dev.config["channel_types"][AINP_CHID] = CBChannelType.AnalogIn
+    return dev
+
+
+def make_tuple(pkt_time: int, chid: int, pkt_type: int, payload: bytes = b"") -> tuple:
+    # The (time, chid, type, dlen, data) tuples the IO thread enqueues.
+    header = packets.CBPacketHeader()
+    header.time = pkt_time
+    header.chid = chid
+    header.type = pkt_type
+    header.dlen = len(payload) // 4
+    return pkt_time, chid, pkt_type, header.dlen, bytes(header) + payload
+
+
+def make_group(pkt_time: int, group: int, samples: list[int]) -> tuple:
+    return make_tuple(
+        pkt_time, CBSpecialChan.GROUP, group, np.array(samples, np.int16).tobytes()
+    )
+
+
+def run_handler(dev: NSPDevice, pkt_tuples: list) -> PacketHandlerThread:
+    handler = PacketHandlerThread(dev)
+    # Enqueue before starting so that all of them are handled in a single drain.
+    handler.receiver_queue.extend(pkt_tuples)
+    handler.start()
+    return handler
+
+
+def test_event_batch_contents_and_routing():
+    dev = make_device()
+    spk_rec, ainp_rec = Recorder(), Recorder()
+    cbsdk.register_spk_batch_callback(dev, spk_rec)
+    cbsdk.register_event_batch_callback(dev, CBChannelType.AnalogIn, ainp_rec)
+    handler = run_handler(
+        dev,
+        [
+            make_tuple(10, SPK_CHIDS[0], 1),
+            make_group(11, 5, [1, 2]),
+            make_tuple(12, AINP_CHID, 0),
+            make_tuple(13, SPK_CHIDS[1], 2),
+            make_tuple(14, CBSpecialChan.CONFIGURATION, CBPacketType.SYSHEARTBEAT),
+            make_tuple(15, SPK_CHIDS[0], 0),
+        ],
+    )
+    try:
+        spk_rec.wait(1)
+        ainp_rec.wait(1)
+    finally:
+        handler.stop()
+        handler.join()
+    times, chids, units = spk_rec.batches[0]
+    assert times.tolist() == [10, 13, 15]
+    assert chids.tolist() == [SPK_CHIDS[0], SPK_CHIDS[1], SPK_CHIDS[0]]
+    assert units.tolist() == [1, 2, 0]
+    assert [_.tolist() for _ in ainp_rec.batches[0]] == [[12], [AINP_CHID], [0]]
+
+
+def test_event_batch_flushes_when_full_and_after_each_drain():
+    dev = make_device()
+    rec = Recorder()
+    cbsdk.register_spk_batch_callback(dev, rec)
+    n_events = EVENT_BATCH_SIZE + 6
+    handler = run_handler(
+        dev, [make_tuple(t, SPK_CHIDS[0], 0) for t in range(n_events)]
+    )
+    try:
+        rec.wait(2)
+        # The next drain is flushed on its own, not held back until the batch fills.
+        handler.receiver_queue.extend(
+            [make_tuple(t, SPK_CHIDS[1], 0) for t in range(n_events, n_events + 2)]
+        )
+        rec.wait(3)
+    finally:
+        handler.stop()
+        handler.join()
+    assert [len(_[0]) for _ in rec.batches] == [EVENT_BATCH_SIZE, 6, 2]
+    all_times = np.concatenate([_[0] for _ in rec.batches])
+    assert all_times.tolist() == list(range(n_events + 2))
+    assert rec.batches[2][1].tolist() == [SPK_CHIDS[1]] * 2
+
+
+def test_group_batch_contents_and_flushing():
+    dev = make_device()
+    rec5, rec6 = Recorder(), Recorder()
+    cbsdk.register_group_batch_callback(dev, 5, rec5)
+    cbsdk.register_group_batch_callback(dev, 6, rec6)
+    handler = run_handler(
+        dev,
+        [
+            make_group(10, 5, [1, 2]),
+            make_group(10, 6, [7, 8, 9, 0]),
+            make_tuple(11, SPK_CHIDS[0], 0),
+            make_group(20, 5, [3, 4]),
+            # A different channel count flushes the packets batched so far.
+            make_group(30, 5, [5, 6, 7, 8]),
+        ],
+    )
+    try:
+        rec5.wait(2)
+        rec6.wait(1)
+    finally:
+        handler.stop()
+        handler.join()
+    (times_a, samples_a), (times_b, samples_b) = rec5.batches
+    assert times_a.tolist() == [10, 20]
+    assert samples_a.tolist() == [[1, 2], [3, 4]]
+    assert times_b.tolist() == [30]
+    assert samples_b.tolist() == [[5, 6, 7, 8]]
+    times, samples = rec6.batches[0]
+    assert times.tolist() == [10]
+    assert samples.dtype == np.int16
+    assert samples.tolist() == [[7, 8, 9, 0]]
+
+
+def test_unregister_event_batch_callback():
+    dev = make_device()
+    spk_rec = Recorder()
+    cbsdk.register_spk_batch_callback(dev, spk_rec)
+    assert cbsdk.unregister_spk_batch_callback(dev, spk_rec) == 0
+    assert cbsdk.unregister_spk_batch_callback(dev, spk_rec) == -1
+    handler = run_handler(
+        dev, [make_tuple(10, SPK_CHIDS[0], 0), make_group(11, 5, [1, 2])]
+    )
+    try:
+        deadline = time.monotonic() + 1.0
+        while handler.receiver_queue and time.monotonic() < deadline:
+            time.sleep(0.001)
+        time.sleep(0.01)
+    finally:
+        handler.stop()
+        handler.join()
+    assert spk_rec.batches == []
+
+
+def test_unregister_group_batch_callback():
+    dev = make_device()
+    rec5, rec6 = Recorder(), Recorder()
+    cbsdk.register_group_batch_callback(dev, 5, rec5)
+    cbsdk.register_group_batch_callback(dev, 6, rec6)
+    assert cbsdk.unregister_group_batch_callback(dev, 5, rec5) == 0
+    assert cbsdk.unregister_group_batch_callback(dev, 5, rec5) == -1
+    handler = run_handler(dev, [make_group(10, 5, [1, 2]), make_group(10, 6, [3, 4])])
+    try:
+        rec6.wait(1)
+    finally:
+        handler.stop()
+        handler.join()
+    assert rec5.batches == []
+
+
+def test_group_raw_callback_gets_packet_bytes():
+    dev = make_device()
+    received = []
+    cbsdk.register_group_raw_callback(
+        dev, 5, lambda pkt_time, data: received.append((pkt_time, bytes(data)))
+    )
+    pkt_tuples = [
+        make_group(10, 5, [1, 2]),
+        make_group(10, 6, [3, 4]),
+        make_group(20, 5, [5, 6]),
+    ]
+    handler = PacketHandlerThread(dev)
+    made = []
+    make_packet = handler._packet_factory.make_packet
+
+    def counting_make_packet(*args):
+        made.append(args)
+        return make_packet(*args)
+
+    handler._packet_factory.make_packet = counting_make_packet
+    handler.receiver_queue.extend(pkt_tuples)
+    handler.start()
+    try:
+        deadline = time.monotonic() + 1.0
+        while len(received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    finally:
+        handler.stop()
+        handler.join()
+    assert received == [(10, pkt_tuples[0][4]), (20, pkt_tuples[2][4])]
+    header_size = dev.packet_factory.header_size
+    assert np.frombuffer(received[1][1][header_size:], np.int16).tolist() == [5, 6]
+    # Only raw callbacks: no packet objects are built.
+    assert made == []
+
+
+def test_group_raw_and_packet_callbacks_together():
+    dev = make_device()
+    raw_times, pkt_times = [], []
+
+    def raw_cb(pkt_time, data):
+        raw_times.append(pkt_time)
+
+    cbsdk.register_group_raw_callback(dev, 5, raw_cb)
+    cbsdk.register_group_callback(dev, 5, lambda pkt: pkt_times.append(pkt.header.time))
+    handler = run_handler(dev, [make_group(10, 5, [1, 2]), make_group(20, 5, [3, 4])])
+    try:
+        deadline = time.monotonic() + 1.0
+        while len(pkt_times) < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert cbsdk.unregister_group_raw_callback(dev, 5, raw_cb) == 0
+        assert cbsdk.unregister_group_raw_callback(dev, 5, raw_cb) == -1
+        handler.receiver_queue.append(make_group(30, 5, [5, 6]))
+        while len(pkt_times) < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    finally:
+        handler.stop()
+        handler.join()
+    assert raw_times == [10, 20]
+    assert pkt_times == [10, 20, 30]
@@ -0,0 +1,116 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from pycbsdk.cbhw import params
+
+CACHED_ADDR = params.KNOWN_INST_ADDRS[1]
+FOUND_ADDR = params.KNOWN_INST_ADDRS[0]
+
+
+def make_adapters(*ips: str) -> list:
+    return [
+        SimpleNamespace(
+            nice_name=f"eth{ix}", ips=[SimpleNamespace(ip=ip, is_IPv4=True)]
+        )
+        for ix, ip in enumerate(ips)
+    ]
+
+
+class FakeNet:
+    """Replaces params' ping and find_responsive_host, recording their calls."""
+
+    def __init__(self, responsive: set):
+        self.responsive = responsive
+        self.pings = []
+        self.n_finds = 0
+
+    def ping(self, host, timeout):
+        self.pings.append(host)
+        return host in self.responsive
+
+    def find_responsive_host(self, hosts):
+        self.n_finds += 1
+        return next((_ for _ in hosts if _ in self.responsive), None)
+
+
+@pytest.fixture
+def net(monkeypatch, tmp_path):
+    monkeypatch.setattr(params, "_net_cache_path", lambda: tmp_path / "net_cache.json")
+    monkeypatch.setattr(params, "_found_inst_addrs", {})
+    fake = FakeNet(responsive={FOUND_ADDR})
+    monkeypatch.setattr(params, "ping", fake.ping)
+    monkeypatch.setattr(params, "find_responsive_host", fake.find_responsive_host)
+    return fake
+
+
+def read_cache(tmp_path) -> dict:
+    with open(tmp_path / "net_cache.json") as f:
+        return json.load(f)
+
+
+def write_cache(tmp_path, cache: dict):
+    with open(tmp_path / "net_cache.json", "w") as f:
+        json.dump(cache, f)
+
+
+def test_cache_miss_probes_and_stores(net, tmp_path):
+    adapters = make_adapters("192.168.137.1")
+    assert params._find_inst_addr(adapters) == FOUND_ADDR
+    assert (net.pings, net.n_finds) == ([], 1)
+    assert read_cache(tmp_path) == {params._adapters_key(adapters): FOUND_ADDR}
+
+
+def test_cache_hit_pings_cached_addr_only(net, tmp_path):
+    adapters = make_adapters("192.168.137.1")
+    write_cache(tmp_path, {params._adapters_key(adapters): CACHED_ADDR})
+    net.responsive.add(CACHED_ADDR)
+    assert params._find_inst_addr(adapters) == CACHED_ADDR
+    assert (net.pings, net.n_finds) == ([CACHED_ADDR], 0)
+    # Found again within the process without probing.
+    assert params._find_inst_addr(adapters) == CACHED_ADDR
+    assert (net.pings, net.n_finds) == ([CACHED_ADDR], 0)
+
+
+def test_stale_cache_entry_is_replaced(net, tmp_path):
+    adapters = make_adapters("192.168.137.1")
+    key = params._adapters_key(adapters)
+    other_key = params._adapters_key(make_adapters("10.0.0.1"))
+    write_cache(tmp_path, {key: CACHED_ADDR, other_key: CACHED_ADDR})
+    assert params._find_inst_addr(adapters) == FOUND_ADDR
+    assert (net.pings, net.n_finds) == ([CACHED_ADDR], 1)
+    assert read_cache(tmp_path) == {key: FOUND_ADDR, other_key: CACHED_ADDR}
+
+
+def test_cache_is_per_adapter_set(net, tmp_path):
+    write_cache(
+        tmp_path, {params._adapters_key(make_adapters("10.0.0.1")): CACHED_ADDR}
+    )
+    net.responsive.add(CACHED_ADDR)
+    assert params._find_inst_addr(make_adapters("192.168.137.1")) == FOUND_ADDR
+    assert net.pings == []
+
+
+def test_no_device_found(net, tmp_path, monkeypatch):
+    net.responsive.clear()
+    adapters = make_adapters("192.168.137.1")
+    assert params._find_inst_addr(adapters) == ""
+    assert not (tmp_path / "net_cache.json").exists()
+    # Not memoized, so a device that comes up later is found.
+    net.responsive.add(FOUND_ADDR)
+    assert params._find_inst_addr(adapters) == FOUND_ADDR
+
+    net.responsive.clear()
+    monkeypatch.setattr(params, "_found_inst_addrs", {})
+    write_cache(tmp_path, {})
+    monkeypatch.setattr(params.ifaddr, "get_adapters", lambda: adapters)
+    with pytest.raises(ValueError, match="inst_addr"):
+        params.Params(client_addr="192.168.137.1")
+
+
+def test_corrupt_cache_is_ignored(net, tmp_path):
+    (tmp_path / "net_cache.json").write_text("{not json")
+    adapters = make_adapters("192.168.137.1")
+    assert params._find_inst_addr(adapters) == FOUND_ADDR
+    assert read_cache(tmp_path) == {params._adapters_key(adapters): FOUND_ADDR}
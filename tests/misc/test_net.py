@@ -0,0 +1,127 @@
+import socket
+import struct
+import subprocess
+import threading
+
+import pytest
+
+from pycbsdk.misc import net
+
+HOST = "192.168.137.200"
+
+
+class FakeICMPSocket:
+    """Stands in for an unprivileged ICMP socket; replies with the queued datagrams."""
+
+    replies = []
+    sent = []
+
+    def __init__(self, family, type_, proto):
+        assert (family, type_, proto) == (
+            socket.AF_INET,
+            socket.SOCK_DGRAM,
+            socket.IPPROTO_ICMP,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def sendto(self, data, addr):
+        self.sent.append((data, addr))
+
+    def settimeout(self, timeout):
+        pass
+
+    def recvfrom(self, bufsize):
+        if not self.replies:
+            raise socket.timeout()
+        return self.replies.pop(0)
+
+
+def echo_reply(b_ip_header: bool = False) -> bytes:
+    icmp = struct.pack("!BBHHH", net.ICMP_ECHO_REPLY, 0, 0, 0, 1)
+    # macOS delivers the 20-byte IPv4 header too.
+    return (b"\x45" + bytes(19) if b_ip_header else b"") + icmp
+
+
+@pytest.fixture
+def icmp(monkeypatch):
+    monkeypatch.setattr(FakeICMPSocket, "replies", [])
+    monkeypatch.setattr(FakeICMPSocket, "sent", [])
+    monkeypatch.setattr(net.socket, "socket", FakeICMPSocket)
+    return FakeICMPSocket
+
+
+@pytest.mark.parametrize("b_ip_header", [False, True])
+def test_icmp_ping_reply(icmp, b_ip_header):
+    icmp.replies = [
+        (echo_reply(b_ip_header), ("10.0.0.1", 0)),  # Some other host's reply.
+        (echo_reply(b_ip_header), (HOST, 0)),
+    ]
+    assert net.ping(HOST)
+    ((request, addr),) = icmp.sent
+    assert addr == (HOST, 0)
+    assert request[0] == net.ICMP_ECHO_REQUEST
+    assert net._icmp_checksum(request) == 0
+
+
+def test_icmp_ping_timeout(icmp):
+    icmp.replies = [(echo_reply(), ("10.0.0.1", 0))]
+    assert not net.ping(HOST, timeout=0.01)
+
+
+def test_ping_falls_back_to_system_ping(monkeypatch):
+    def refuse(*args):
+        raise PermissionError("no unprivileged ICMP")
+
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append((args, kwargs["timeout"]))
+        stdout = net._PING_SUCCESS_FMT.format(host=HOST).encode()
+        return subprocess.CompletedProcess(args, 0, stdout=stdout)
+
+    monkeypatch.setattr(net.socket, "socket", refuse)
+    monkeypatch.setattr(net.subprocess, "run", run)
+    monkeypatch.setattr(net, "_PING_WAIT_SCALE", 1000)
+    assert net.ping(HOST, timeout=0.25)
+    ((args, timeout),) = calls
+    assert args == ["ping", net._PING_COUNT_FLAG, "1", net._PING_WAIT_FLAG, "250", HOST]
+    assert timeout == pytest.approx(1.25)
+
+
+@pytest.mark.parametrize(
+    "error", [FileNotFoundError("ping"), subprocess.TimeoutExpired("ping", 1.0)]
+)
+def test_ping_system_ping_failure(monkeypatch, error):
+    def refuse(*args):
+        raise PermissionError("no unprivileged ICMP")
+
+    def run(args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(net.socket, "socket", refuse)
+    monkeypatch.setattr(net.subprocess, "run", run)
+    assert not net.ping(HOST)
+
+
+def test_find_responsive_host_pings_in_parallel(monkeypatch):
+    hosts = ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    # Every ping must be in flight at once to get past the barrier.
+    barrier = threading.Barrier(len(hosts), timeout=1.0)
+
+    def fake_ping(host, timeout):
+        barrier.wait()
+        return host != hosts[0]
+
+    monkeypatch.setattr(net, "ping", fake_ping)
+    # The first responsive host in the given order wins.
+    assert net.find_responsive_host(hosts) == hosts[1]
+
+
+def test_find_responsive_host_none(monkeypatch):
+    monkeypatch.setattr(net, "ping", lambda host, timeout: False)
+    assert net.find_responsive_host(["10.0.0.1", "10.0.0.2"]) is None